@@ -0,0 +1,280 @@
+"""
+Reproducible throughput benchmarks for Sudoku generation and solving.
+
+Usage:
+    python sudoku_benchmark.py [--count N] [--seed S] [--output results.json]
+    python sudoku_benchmark.py --compare baseline.json [--tolerance 0.1]
+
+Every corpus is generated from the master seed, so two runs with the same
+options measure exactly the same puzzles. Results are printed as a table
+and can be written as JSON to compare against a later run.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from sudoku_class import GENERATION_METHODS, Sudoku, SudokuSolver
+
+# Difficulty levels by number of empty cells, as used in sudoku_solver.py.
+DIFFICULTY_LEVELS = {
+    "easy": (40, 45),
+    "medium": (46, 49),
+    "difficult": (50, 53),
+    "extremely difficult": (54, 58),
+}
+
+GENERATION_GAPS = (40, 50, 55)
+
+
+def _percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = round(fraction * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+def _measure(function, items, memory_sample=50):
+    """
+    Time a function over a list of items and measure its peak memory.
+
+    Latencies come from a plain pass; peak memory comes from a second pass
+    over the first `memory_sample` items with tracemalloc enabled, so the
+    tracing overhead never shows up in the timings.
+
+    Returns:
+        dict: Throughput, latency percentiles in milliseconds and peak memory.
+    """
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        item_start = time.perf_counter()
+        function(item)
+        latencies.append(time.perf_counter() - item_start)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for item in items[:memory_sample]:
+        function(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "count": len(items),
+        "elapsed_s": elapsed,
+        "puzzles_per_s": len(items) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": 1000 * elapsed / len(items) if items else 0.0,
+        "p50_ms": 1000 * _percentile(latencies, 0.50),
+        "p99_ms": 1000 * _percentile(latencies, 0.99),
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+def build_corpus(level, count, seed):
+    """
+    Build a seeded corpus of uniquely solvable puzzles for a difficulty level.
+
+    Gap counts cycle through the level's range so every level is covered
+    evenly.
+
+    Returns:
+        list: The puzzles as 1D lists in the get_board_gaps format.
+    """
+    low, high = DIFFICULTY_LEVELS[level]
+    return [
+        Sudoku(
+            low + index % (high - low + 1), unique=True, seed=f"{seed}:{level}:{index}"
+        ).get_board_gaps()
+        for index in range(count)
+    ]
+
+
+def benchmark_generation(count, seed):
+    """
+    Measure Sudoku construction at several gap counts for every generation
+    method, with and without carving.
+    """
+    results = []
+    for method in GENERATION_METHODS:
+        for unique in (False, True):
+            for gaps in GENERATION_GAPS:
+                seeds = [f"{seed}:generate:{gaps}:{index}" for index in range(count)]
+                stats = _measure(
+                    lambda puzzle_seed: Sudoku(
+                        gaps, unique=unique, seed=puzzle_seed, method=method
+                    ),
+                    seeds,
+                    memory_sample=5,
+                )
+                results.append(
+                    {"method": method, "gaps": gaps, "unique": unique, **stats}
+                )
+    return results
+
+
+def benchmark_solving(corpora):
+    """Measure SudokuSolver.solve_sudoku_board on each difficulty corpus."""
+    results = []
+    solver = SudokuSolver()
+    for level, boards in corpora.items():
+        stats = _measure(solver.solve_sudoku_board, boards)
+        solved = sum(
+            not isinstance(result, str) for result in solver.solve_many(boards)
+        )
+        results.append({"level": level, "solved": solved, **stats})
+    return results
+
+
+def benchmark_techniques(corpora):
+    """
+    Measure the calls, time and board changes of each solver technique.
+
+    A separate solver with collect_stats=True is used, so the throughput
+    numbers are never taken with instrumentation enabled.
+    """
+    results = {}
+    for level, boards in corpora.items():
+        solver = SudokuSolver(collect_stats=True)
+        for board_list in boards:
+            solver.solve_sudoku_board(board_list)
+        results[level] = solver.get_stats(total=True)
+    return results
+
+
+def run_benchmarks(count, generation_count, seed):
+    """Run every benchmark and return the results as a JSON-ready dict."""
+    corpora = {level: build_corpus(level, count, seed) for level in DIFFICULTY_LEVELS}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "count": count,
+            "generation_count": generation_count,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "generation": benchmark_generation(generation_count, seed),
+        "solving": benchmark_solving(corpora),
+        "techniques": benchmark_techniques(corpora),
+    }
+
+
+def print_report(results):
+    """Print the benchmark results as plain-text tables."""
+    header = f"{'':<28}{'puzzles/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>10}"
+
+    def row(label, stats):
+        print(
+            f"{label:<28}{stats['puzzles_per_s']:>12.1f}{stats['p50_ms']:>10.3f}"
+            f"{stats['p99_ms']:>10.3f}{stats['peak_memory_kib']:>10.1f}"
+        )
+
+    print("Generation")
+    print(header)
+    for stats in results["generation"]:
+        mode = "unique" if stats["unique"] else "any"
+        row(f"{stats['method']}, {stats['gaps']} gaps, {mode}", stats)
+
+    print("\nSolving")
+    print(header)
+    for stats in results["solving"]:
+        row(f"{stats['level']} ({stats['solved']}/{stats['count']})", stats)
+
+    print("\nTechniques")
+    print(f"{'':<28}{'calls':>12}{'total ms':>10}{'placed':>10}{'removed':>10}")
+    for level, techniques in results["techniques"].items():
+        print(f"  {level}")
+        for name, totals in techniques.items():
+            print(
+                f"    {name:<24}{totals['calls']:>12}{1000 * totals['time']:>10.2f}"
+                f"{totals['placements']:>10}{totals['eliminations']:>10}"
+            )
+
+
+def compare_results(baseline, current, tolerance):
+    """
+    Print throughput ratios against a baseline run.
+
+    Benchmarks are matched by name, so cases missing from either run are
+    skipped.
+
+    Returns:
+        bool: True if any benchmark is slower than the baseline by more
+              than `tolerance` (e.g. 0.1 for 10%).
+    """
+    regressed = False
+
+    def labelled(results):
+        # Runs from before generation methods existed only used "random".
+        labels = {
+            f"generation {stats.get('method', 'random')} {stats['gaps']} gaps"
+            f" unique={stats['unique']}": stats
+            for stats in results["generation"]
+        }
+        labels.update(
+            (f"solving {stats['level']}", stats) for stats in results["solving"]
+        )
+        return labels
+
+    old_results = labelled(baseline)
+    pairs = [
+        (label, old_results[label], new)
+        for label, new in labelled(current).items()
+        if label in old_results
+    ]
+
+    print("\nComparison with baseline (puzzles/s)")
+    for label, old, new in pairs:
+        ratio = 0.0
+        if old["puzzles_per_s"]:
+            ratio = new["puzzles_per_s"] / old["puzzles_per_s"]
+        flag = ""
+        if ratio < 1 - tolerance:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"  {label:<50}{ratio:>8.2f}x{flag}")
+    return regressed
+
+
+def main(argv=None):
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--count", type=int, default=50, help="puzzles per difficulty level"
+    )
+    parser.add_argument(
+        "--generation-count", type=int, default=20, help="boards per generation case"
+    )
+    parser.add_argument("--seed", default="0", help="master seed for every corpus")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file from an earlier run")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="allowed throughput drop against the baseline (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.count, args.generation_count, args.seed)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            if compare_results(json.load(baseline_file), results, args.tolerance):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
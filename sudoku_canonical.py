@@ -0,0 +1,285 @@
+import hashlib
+import itertools
+
+# The Sudoku symmetry group: transposition, band and stack permutations, row
+# and column permutations within them, and digit relabelling. The canonical
+# form of a board is the smallest one (read row by row, empty cells as 0)
+# that the group can turn it into, with digits relabelled 1, 2, 3, ... in
+# order of first appearance.
+#
+# A transform is stored as (cells, labels): cell k of the transformed board
+# is cell cells[k] of the original, with digit d replaced by labels[d].
+
+BANDS = ((0, 1, 2), (3, 4, 5), (6, 7, 8))
+TRANSPOSED_CELLS = tuple((i % 9) * 9 + i // 9 for i in range(81))
+
+
+def _board_digits(board_list):
+    """Return a board as a tuple of 81 integers with 0 for empty cells."""
+    if len(board_list) != 81:
+        raise ValueError("Input list must contain exactly 81 elements.")
+    return tuple(
+        0 if value == "X" or value is None else int(value) for value in board_list
+    )
+
+
+def _empty_pattern(row):
+    """Return the smallest empty/filled pattern a row can be arranged into."""
+    counts = sorted(
+        (sum(not row[col] for col in stack) for stack in BANDS), reverse=True
+    )
+    return sum(((0,) * count + (1,) * (3 - count) for count in counts), ())
+
+
+def _blank_rows(grid):
+    """Return the rows of a grid that have no digits."""
+    return {row for row in range(9) if not any(grid[row * 9 : row * 9 + 9])}
+
+
+def _row_choices(rows, blank_rows):
+    """
+    Drop the rows that can only repeat an earlier choice.
+
+    An empty row can be swapped with any other empty row of its band, and
+    an empty band with any other empty band, without changing the board.
+    """
+    if not blank_rows:
+        return rows
+    choices = []
+    seen = set()
+    for row in rows:
+        if row in blank_rows:
+            band = row // 3
+            key = "band" if blank_rows.issuperset(BANDS[band]) else band
+            if key in seen:
+                continue
+            seen.add(key)
+        choices.append(row)
+    return choices
+
+
+def _in_order(values):
+    """Return True if the values are in increasing order."""
+    values = list(values)
+    return values == sorted(values)
+
+
+def _first_row_orders(row, blank_columns):
+    """
+    Return every column order that gives a row its smallest relabelled form.
+
+    Relabelled digits in a row always read 1, 2, 3, ... from left to right,
+    so a row is smallest when its empty cells come first: stacks with more
+    empty cells first, and empty cells first within each stack.
+
+    Swapping two columns that are empty in every row, or two stacks made
+    of such columns, changes nothing, so those are only kept in one order.
+    """
+    stacks = []
+    for number, stack in enumerate(BANDS):
+        empty = [col for col in stack if not row[col]]
+        filled = [col for col in stack if row[col]]
+        stacks.append(
+            (
+                len(empty),
+                number if blank_columns.issuperset(stack) else None,
+                [
+                    first + second
+                    for first in itertools.permutations(empty)
+                    if not blank_columns
+                    or _in_order(col for col in first if col in blank_columns)
+                    for second in itertools.permutations(filled)
+                ],
+            )
+        )
+
+    orders = []
+    for stack_order in itertools.permutations(stacks):
+        counts = [count for count, _, _ in stack_order]
+        blank_stacks = [number for _, number, _ in stack_order if number is not None]
+        if counts == sorted(counts, reverse=True) and _in_order(blank_stacks):
+            for parts in itertools.product(*(inner for _, _, inner in stack_order)):
+                orders.append(sum(parts, ()))
+    return orders
+
+
+def canonicalize(board_list):
+    """
+    Find the canonical form of a board and the transform that produces it.
+
+    The rows of the canonical form are fixed one at a time, keeping only the
+    partial transforms that give the smallest row so far. Ties are all kept,
+    so the result is exact: two boards have the same canonical form if and
+    only if one is a transformation of the other. Empty rows, columns and
+    bands are interchangeable, so only one arrangement of them is followed.
+
+    Parameters:
+        board_list (list): A list of 81 values. Use 'X', None or 0 for empty cells.
+
+    Returns:
+        tuple: The canonical board as a tuple of 81 integers, and the
+                (cells, labels) transform that maps the board onto it.
+    """
+    digits = _board_digits(board_list)
+    grids = (digits, tuple(digits[i] for i in TRANSPOSED_CELLS))
+
+    # The first row fixes the column order, up to ties.
+    # The empty columns of a grid are the empty rows of its transpose.
+    blank_rows = [_blank_rows(grid) for grid in grids]
+    first_rows = []
+    for transposed, grid in enumerate(grids):
+        for row in _row_choices(range(9), blank_rows[transposed]):
+            values = grid[row * 9 : row * 9 + 9]
+            first_rows.append((_empty_pattern(values), transposed, row, values))
+    best_pattern = min(pattern for pattern, _, _, _ in first_rows)
+
+    states = []
+    for pattern, transposed, row, values in first_rows:
+        if pattern != best_pattern:
+            continue
+        for order in _first_row_orders(values, blank_rows[1 - transposed]):
+            labels = [0] * 10
+            next_label = 1
+            for col in order:
+                if values[col]:
+                    labels[values[col]] = next_label
+                    next_label += 1
+            states.append((transposed, (row,), order, labels, next_label))
+    transposed, (row,), order, labels, _ = states[0]
+    canonical = [labels[grids[transposed][row * 9 + col]] for col in order]
+
+    for position in range(1, 9):
+        best_row = None
+        best_states = []
+        for transposed, rows, order, labels, next_label in states:
+            grid = grids[transposed]
+            if position % 3:
+                band = BANDS[rows[-1] // 3]
+                candidates = [row for row in band if row not in rows]
+            else:
+                used = {row // 3 for row in rows}
+                candidates = [row for row in range(9) if row // 3 not in used]
+
+            for row in _row_choices(candidates, blank_rows[transposed]):
+                start = row * 9
+                row_labels = labels
+                row_next = next_label
+                key = []
+                for col in order:
+                    value = grid[start + col]
+                    if value:
+                        label = row_labels[value]
+                        if not label:
+                            if row_labels is labels:
+                                row_labels = labels[:]
+                            label = row_labels[value] = row_next
+                            row_next += 1
+                        key.append(label)
+                    else:
+                        key.append(0)
+                    if best_row is not None and key > best_row[: len(key)]:
+                        break
+                else:
+                    if best_row is None or key < best_row:
+                        best_row = key
+                        best_states = []
+                    best_states.append(
+                        (transposed, rows + (row,), order, row_labels, row_next)
+                    )
+        states = best_states
+        canonical.extend(best_row)
+
+    transposed, rows, order, labels, next_label = states[0]
+    cells = tuple(row * 9 + col for row in rows for col in order)
+    if transposed:
+        cells = tuple(TRANSPOSED_CELLS[cell] for cell in cells)
+    # Digits missing from the board take the remaining labels, so the
+    # relabelling is always a full permutation that can be inverted.
+    for digit in range(1, 10):
+        if not labels[digit]:
+            labels[digit] = next_label
+            next_label += 1
+    return tuple(canonical), (cells, tuple(labels))
+
+
+def canonical_form(board_list):
+    """Return the canonical form of a board as a tuple of 81 integers."""
+    return canonicalize(board_list)[0]
+
+
+def canonical_hash(board_list):
+    """
+    Return a 64-bit hash of a board's canonical form as 16 hex characters.
+
+    Boards that are transformations of each other share the same hash, so
+    a corpus can be deduplicated by hash alone.
+    """
+    digest = hashlib.blake2b(bytes(canonical_form(board_list)), digest_size=8)
+    return digest.hexdigest()
+
+
+def _keyed_hash(board_list):
+    """Return a board together with its canonical hash, for hash_parallel."""
+    return board_list, canonical_hash(board_list)
+
+
+def hash_parallel(boards, workers=None, chunksize=256, keyed=False):
+    """
+    Computes canonical hashes across a pool of worker processes.
+
+    Parameters:
+        boards (iterable): Boards in any format accepted by canonical_form.
+                        Consumed lazily.
+        workers (int): Number of worker processes, defaults to the CPU count.
+        chunksize (int): Number of boards dispatched to a worker at once.
+        keyed (bool): Yield (board, hash) pairs, so callers that need the
+                    boards too don't have to read the stream twice.
+
+    Yields:
+        str | tuple: The canonical hash of each board, in input order.
+    """
+    import multiprocessing
+
+    worker = _keyed_hash if keyed else canonical_hash
+    with multiprocessing.Pool(processes=workers) as pool:
+        yield from pool.imap(worker, boards, chunksize)
+
+
+def apply_transform(board_list, transform):
+    """Transform a board with a (cells, labels) transform from canonicalize."""
+    digits = _board_digits(board_list)
+    cells, labels = transform
+    return [labels[digits[cell]] for cell in cells]
+
+
+def invert_transform(board_list, transform):
+    """Map a transformed board back, undoing a (cells, labels) transform."""
+    digits = _board_digits(board_list)
+    cells, labels = transform
+    digit_of = [0] * 10
+    for digit, label in enumerate(labels):
+        digit_of[label] = digit
+    original = [0] * 81
+    for position, cell in enumerate(cells):
+        original[cell] = digit_of[digits[position]]
+    return original
+
+
+def dedupe_boards(boards):
+    """
+    Yield the boards of a stream that are not transformations of earlier ones.
+
+    Only the 8-byte hashes of the boards seen so far are kept in memory.
+
+    Parameters:
+        boards (iterable): Boards in any format accepted by canonical_form.
+
+    Yields:
+        list: Each board whose canonical form was not seen before.
+    """
+    seen = set()
+    for board_list in boards:
+        key = canonical_hash(board_list)
+        if key not in seen:
+            seen.add(key)
+            yield board_list
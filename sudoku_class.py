@@ -1,24 +1,327 @@
 import random
+import collections
 import copy
+import functools
 import os
+import time
+
+from sudoku_canonical import apply_transform, canonicalize, invert_transform
+
+
+# multiprocessing is imported inside the *_parallel methods, so importing this
+# module stays cheap for worker processes that never start a pool.
+
+# Bitmask helpers: digit n is stored as bit (n - 1) of a 9-bit candidate mask.
+ALL_DIGITS_MASK = 0x1FF
+DIGIT_BIT = (0,) + tuple(1 << (n - 1) for n in range(1, 10))
+BIT_COUNT = tuple(bin(mask).count("1") for mask in range(512))
+MASK_DIGITS = tuple(
+    tuple(n for n in range(1, 10) if mask & DIGIT_BIT[n]) for mask in range(512)
+)
+
+EMPTY_BOARD = (0,) * 81
+EMPTY_UNITS = (0,) * 9
+
+CELL_ROW = tuple(i // 9 for i in range(81))
+CELL_COL = tuple(i % 9 for i in range(81))
+CELL_BOX = tuple((i // 9 // 3) * 3 + (i % 9) // 3 for i in range(81))
+
+# Static unit and peer tables, built once so placements only touch related cells.
+ROW_UNITS = tuple(tuple(r * 9 + c for c in range(9)) for r in range(9))
+COL_UNITS = tuple(tuple(r * 9 + c for r in range(9)) for c in range(9))
+BOX_UNITS = tuple(tuple(i for i in range(81) if CELL_BOX[i] == b) for b in range(9))
+UNITS = ROW_UNITS + COL_UNITS + BOX_UNITS
+GROUP_UNITS = {"row": ROW_UNITS, "col": COL_UNITS, "box": BOX_UNITS}
+# Positions of a cell's row, column and box in UNITS, and of each group.
+CELL_UNIT_IDS = tuple(
+    (CELL_ROW[i], 9 + CELL_COL[i], 18 + CELL_BOX[i]) for i in range(81)
+)
+GROUP_UNIT_IDS = {"row": range(0, 9), "col": range(9, 18), "box": range(18, 27)}
+CELL_UNITS = tuple(
+    (ROW_UNITS[CELL_ROW[i]], COL_UNITS[CELL_COL[i]], BOX_UNITS[CELL_BOX[i]])
+    for i in range(81)
+)
+PEERS = tuple(
+    tuple(sorted(set(sum(CELL_UNITS[i], ())) - {i})) for i in range(81)
+)
+
+# Logical techniques known to SudokuSolver, from cheapest to most expensive.
+TECHNIQUES = (
+    "hidden_singles_box",
+    "hidden_singles_row",
+    "hidden_singles_column",
+    "naked_singles",
+    "naked_pairs",
+    "hidden_pairs",
+    "x_wing",
+    "swordfish",
+)
+
+# Difficulty level of a puzzle by the hardest technique it needs to be solved.
+# "search" means the logical techniques stall and a guess is required.
+TECHNIQUE_LEVELS = {
+    "hidden_singles_box": "easy",
+    "hidden_singles_row": "easy",
+    "hidden_singles_column": "easy",
+    "naked_singles": "medium",
+    "naked_pairs": "difficult",
+    "hidden_pairs": "difficult",
+    "x_wing": "extremely difficult",
+    "swordfish": "extremely difficult",
+    "search": "extremely difficult",
+}
+
+# Grades a generated puzzle can be aimed at, from the easiest to the hardest.
+GRADES = TECHNIQUES + ("search",)
+
+# Complete grids that the "transform" generation method starts from. Every
+# transform preserves validity, so each one stands for about 10^12 grids.
+SEED_GRIDS = (
+    "476239518159468327283157946895642731364571892721983654538714269612895473947326185",
+    "432975681865321749719864352973286514246159873581437926157643298398712465624598137",
+    "394562178128937546675418932946875321832691457751324689267153894413789265589246713",
+    "458961273276483159391572846817346925923157684645298731184739562562814397739625418",
+    "764158923329674518815329764951847236273561849486293157197432685542986371638715492",
+    "243691578568723491917584623476152389129836754385479162692345817831267945754918236",
+    "214385967958726134736941852379468215841592376625137498182679543497853621563214789",
+    "279563814436178529581294673745629381192387456368451792923845167817936245654712938",
+)
+
+GENERATION_METHODS = ("backtrack", "random", "transform")
+
+UNSOLVABLE_MESSAGE = "This sudoku doesn't have single solution."
+
+# No Sudoku with fewer givens has a single solution.
+MIN_UNIQUE_GIVENS = 17
+
+
+def encode_board(board_list):
+    """
+    Encode a 1D board as an 81-character digit string with '0' for empty cells.
+
+    Parameters:
+        board_list (list): A list of 81 values. Use 'X', None or 0 for empty cells.
+
+    Returns:
+        str: The compact string form of the board.
+    """
+    return "".join(
+        "0" if value == "X" or value is None else str(value) for value in board_list
+    )
+
+
+def decode_board(board_string):
+    """Decode an 81-character digit string into a 1D list of integers."""
+    return [int(char) for char in board_string]
+
+
+def generate_grid(rng, max_backtracks=100, max_restarts=100):
+    """
+    Fill an empty grid by randomized backtracking.
+
+    The next cell is always the one with the fewest candidates left (MRV) and
+    its digits are tried in random order. A dead end only undoes the latest
+    placements; an attempt that backtracks more than `max_backtracks` times
+    starts over from an empty grid, which bounds the work per attempt.
+
+    Parameters:
+        rng (random.Random): Source of randomness.
+        max_backtracks (int): Backtracks allowed before restarting.
+        max_restarts (int): Restarts allowed before giving up.
+
+    Returns:
+        tuple: The grid as 81 integers and a dict with the number of
+                "backtracks" and "restarts" it took.
+    """
+    backtracks = 0
+    for restarts in range(max_restarts + 1):
+        values = [0] * 81
+        row_used = [0] * 9
+        col_used = [0] * 9
+        box_used = [0] * 9
+        empty = list(range(81))
+        stack = []  # (index, untried digits) for every filled cell
+        attempt_backtracks = 0
+
+        while empty and attempt_backtracks <= max_backtracks:
+            best_index = best_mask = 0
+            best_count = 10
+            for index in empty:
+                mask = ALL_DIGITS_MASK & ~(
+                    row_used[CELL_ROW[index]]
+                    | col_used[CELL_COL[index]]
+                    | box_used[CELL_BOX[index]]
+                )
+                count = BIT_COUNT[mask]
+                if count < best_count:
+                    best_index, best_mask, best_count = index, mask, count
+                    if count < 2:
+                        break
+
+            if best_count:
+                digits = list(MASK_DIGITS[best_mask])
+                rng.shuffle(digits)
+                empty.remove(best_index)
+                stack.append((best_index, digits))
+            else:
+                # Undo placements until a cell still has an untried digit.
+                attempt_backtracks += 1
+                while True:
+                    index, digits = stack[-1]
+                    bit = ~DIGIT_BIT[values[index]]
+                    row_used[CELL_ROW[index]] &= bit
+                    col_used[CELL_COL[index]] &= bit
+                    box_used[CELL_BOX[index]] &= bit
+                    if digits:
+                        break
+                    stack.pop()
+                    empty.append(index)
+
+            index, digits = stack[-1]
+            number = digits.pop()
+            values[index] = number
+            bit = DIGIT_BIT[number]
+            row_used[CELL_ROW[index]] |= bit
+            col_used[CELL_COL[index]] |= bit
+            box_used[CELL_BOX[index]] |= bit
+
+        backtracks += attempt_backtracks
+        if not empty:
+            return values, {"backtracks": backtracks, "restarts": restarts}
+    raise ValueError("Sudoku generation failed after maximum attempts.")
+
+
+def _shuffled_lines(rng):
+    """Return a random order of the 9 rows (or columns) that keeps bands intact."""
+    bands = rng.sample(range(3), k=3)
+    return [band * 3 + line for band in bands for line in rng.sample(range(3), k=3)]
+
+
+def transform_grid(grid, rng):
+    """
+    Apply a random validity-preserving transform to a complete grid.
+
+    The transform relabels the digits, shuffles the bands and stacks, shuffles
+    the rows and columns within them and optionally transposes the grid, so a
+    valid grid always maps to another valid grid in constant time.
+
+    Parameters:
+        grid (list | str): 81 digits of a complete grid.
+        rng (random.Random): Source of randomness.
+
+    Returns:
+        list: The transformed grid as 81 integers.
+    """
+    labels = [0] + rng.sample(range(1, 10), k=9)
+    rows = _shuffled_lines(rng)
+    cols = _shuffled_lines(rng)
+    if rng.random() < 0.5:
+        cells = [rows[c] + 9 * cols[r] for r in range(9) for c in range(9)]
+    else:
+        cells = [rows[r] * 9 + cols[c] for r in range(9) for c in range(9)]
+    return [labels[int(grid[i])] for i in cells]
+
+
+_worker_solver = None
+
+
+def _init_solver_worker():
+    """Create the SudokuSolver reused by a pool worker process."""
+    global _worker_solver
+    _worker_solver = SudokuSolver()
+
+
+def _solve_encoded_board(board_string):
+    """Solve an encoded board in a pool worker, returning it encoded or None."""
+    result = _worker_solver.solve_sudoku_board(decode_board(board_string))
+    return None if isinstance(result, str) else encode_board(result)
+
+
+def _count_encoded_board(limit, board_string):
+    """Count the solutions of an encoded board in a pool worker."""
+    return _worker_solver.count_solutions(decode_board(board_string), limit)
+
+
+def _grade_encoded_board(board_string):
+    """Grade an encoded board in a pool worker."""
+    return _worker_solver.grade_sudoku_board(decode_board(board_string))
+
+
+def _generate_encoded_puzzle(options):
+    """Generate a puzzle in a pool worker, returning the encoded gaps and solution."""
+    gaps, unique, symmetric, seed, method, hardest = options
+    sudoku = Sudoku(
+        gaps,
+        unique=unique,
+        symmetric=symmetric,
+        seed=seed,
+        method=method,
+        hardest=hardest,
+    )
+    return (
+        encode_board(sudoku.get_board_gaps()),
+        encode_board(sudoku.get_board_solution()),
+    )
 
 
 class Sudoku:
     """Sudoku class for generating Sudoku puzzles."""
 
-    def __init__(self, gaps: int):
+    def __init__(
+        self,
+        gaps: int,
+        unique: bool = False,
+        symmetric: bool = False,
+        seed=None,
+        method: str = "backtrack",
+        hardest: str = None,
+        attempts: int = 1_000,
+    ):
         """
         Initialize the Sudoku class.
 
         Parameters:
             gaps (int): Number of empty cells (gaps) in the Sudoku board.
+            unique (bool): Carve gaps one at a time, keeping only removals
+                        that leave the puzzle with a single solution.
+            symmetric (bool): In unique mode, remove cells in pairs that are
+                        symmetric about the centre of the board.
+            seed: Seed for this board's random generator. The same seed and
+                        options always produce the same board.
+            method (str): How complete grids are built. "backtrack" fills
+                        them by randomized MRV backtracking (see
+                        generate_grid); "random" fills the cells one by one
+                        and restarts on dead ends; "transform" applies a
+                        random symmetry to one of the SEED_GRIDS, which
+                        takes constant time.
+            hardest (str): Target grade from GRADES, e.g. "x_wing" for a
+                        puzzle that needs X-Wing but not Swordfish. Implies
+                        unique. "search" asks for a puzzle that none of the
+                        logical techniques can finish.
+            attempts (int): Complete grids to try carving in unique mode
+                        before giving up with a ValueError.
         """
+        if method not in GENERATION_METHODS:
+            raise ValueError(
+                f"Invalid method. Use {' or '.join(map(repr, GENERATION_METHODS))}."
+            )
+        if hardest is not None and hardest not in GRADES:
+            raise ValueError(f"Invalid grade. Use one of {', '.join(GRADES)}.")
+        self.__method = method
+        self.__attempts = attempts
+        self.__random = random.Random(seed)
+        self.__generation_stats = {"grids": 0, "backtracks": 0, "restarts": 0}
         self.__board_metadata = {}
         self.__num_gaps = gaps
-        self.__complete_board = self.__generate_complete_board()
-        self.__board_with_gaps = self.__apply_gaps(
-            self.__complete_board, self.__num_gaps
-        )
+        if unique or hardest is not None:
+            self.__complete_board, self.__board_with_gaps = (
+                self.__generate_unique_puzzle(self.__num_gaps, symmetric, hardest)
+            )
+        else:
+            self.__complete_board = self.__new_complete_board()
+            self.__board_with_gaps = self.__apply_gaps(
+                self.__complete_board, self.__num_gaps
+            )
         self._update_possibilities(self.__board_with_gaps)
 
     def __initialize_metadata(self):
@@ -34,56 +337,20 @@ class Sudoku:
                 "state": "ready",
             }
 
-    def __update_constraints(self, row: int, col: int, box: int, number: int):
+    def __update_constraints(self, index: int, number: int):
         """Update possible values for cells in the same row, column, or box."""
-        for i in range(81):
-            if number in self.__board_metadata[i]["possibilities"] and (
-                self.__board_metadata[i]["row"] == row
-                or self.__board_metadata[i]["col"] == col
-                or self.__board_metadata[i]["box"] == box
-            ):
+        for i in (index,) + PEERS[index]:
+            if number in self.__board_metadata[i]["possibilities"]:
                 self.__board_metadata[i]["possibilities"].remove(number)
 
     @staticmethod
     def _update_possibilities(data):
         """Update possible values for empty cells based on Sudoku rules."""
-        for i in range(9):
-            # Update rows
-            row_start = i * 9
+        for unit in UNITS:
             checked_values = [
-                data[row_start + j]["value"]
-                for j in range(9)
-                if data[row_start + j]["state"] == "checked"
+                data[idx]["value"] for idx in unit if data[idx]["state"] == "checked"
             ]
-            for j in range(9):
-                cell = data[row_start + j]
-                if cell["state"] == "empty":
-                    cell["possibilities"] = [
-                        p for p in cell["possibilities"] if p not in checked_values
-                    ]
-
-            # Update columns
-            checked_values = [
-                data[j * 9 + i]["value"]
-                for j in range(9)
-                if data[j * 9 + i]["state"] == "checked"
-            ]
-            for j in range(9):
-                cell = data[j * 9 + i]
-                if cell["state"] == "empty":
-                    cell["possibilities"] = [
-                        p for p in cell["possibilities"] if p not in checked_values
-                    ]
-
-            # Update boxes
-            box_start = (i // 3) * 27 + (i % 3) * 3
-            box_indices = [box_start + (j // 3) * 9 + (j % 3) for j in range(9)]
-            checked_values = [
-                data[idx]["value"]
-                for idx in box_indices
-                if data[idx]["state"] == "checked"
-            ]
-            for idx in box_indices:
+            for idx in unit:
                 cell = data[idx]
                 if cell["state"] == "empty":
                     cell["possibilities"] = [
@@ -97,29 +364,25 @@ class Sudoku:
             number = cell["possibilities"].pop()
             cell["value"] = number
             cell["state"] = "checked"
-            self.__update_constraints(cell["row"], cell["col"], cell["box"], number)
+            self.__update_constraints(index, number)
 
     def __generate_complete_board(self):
         """Generate a complete Sudoku board."""
         self.__initialize_metadata()
-        for _ in range(10_000):
+        for restarts in range(10_000):
             try:
                 for index in range(81):
                     if self.__board_metadata[index]["state"] == "ready":
-                        number = random.choice(
+                        number = self.__random.choice(
                             self.__board_metadata[index]["possibilities"]
                         )
                         self.__board_metadata[index]["value"] = number
                         self.__board_metadata[index]["state"] = "checked"
-                        self.__update_constraints(
-                            self.__board_metadata[index]["row"],
-                            self.__board_metadata[index]["col"],
-                            self.__board_metadata[index]["box"],
-                            number,
-                        )
+                        self.__update_constraints(index, number)
 
                 for index in range(81):
                     self.__fill_cell(index)
+                self.__generation_stats["restarts"] += restarts
                 return self.__board_metadata  # Return if successful
 
             except Exception:
@@ -127,12 +390,35 @@ class Sudoku:
         else:
             raise ValueError("Sudoku generation failed after maximum attempts.")
 
+    def __metadata_from_grid(self, grid):
+        """Fill the board metadata from a complete grid of 81 integers."""
+        self.__initialize_metadata()
+        for index, number in enumerate(grid):
+            cell = self.__board_metadata[index]
+            cell["value"] = number
+            cell["state"] = "checked"
+            cell["possibilities"] = []
+        return self.__board_metadata
+
+    def __new_complete_board(self):
+        """Generate a complete Sudoku board with the configured method."""
+        self.__generation_stats["grids"] += 1
+        if self.__method == "transform":
+            grid = transform_grid(self.__random.choice(SEED_GRIDS), self.__random)
+            return self.__metadata_from_grid(grid)
+        if self.__method == "backtrack":
+            grid, stats = generate_grid(self.__random)
+            self.__generation_stats["backtracks"] += stats["backtracks"]
+            self.__generation_stats["restarts"] += stats["restarts"]
+            return self.__metadata_from_grid(grid)
+        return self.__generate_complete_board()
+
     def __apply_gaps(self, board, num_gaps):
         """Mark a specified number of cells as empty."""
         board_copy = copy.deepcopy(board)
 
         while num_gaps > 0:
-            indices = random.sample(range(81), k=num_gaps)
+            indices = self.__random.sample(range(81), k=num_gaps)
             for i in indices:
                 if board_copy[i]["state"] != "empty":
                     board_copy[i]["state"] = "empty"
@@ -142,6 +428,87 @@ class Sudoku:
                         break
         return board_copy
 
+    def __carve_unique_gaps(self, board, num_gaps, symmetric, solver, hardest=None):
+        """
+        Remove cells one at a time while the puzzle keeps a single solution.
+
+        With a target grade, a removal is only kept if the techniques up to
+        `hardest` can still solve the puzzle, which also proves it is unique.
+        Every removal that has to be undone pins a cell for good, so the board
+        is abandoned as soon as too few cells are left to reach `num_gaps`.
+
+        Returns:
+            dict | None: The board with gaps, or None if `num_gaps` removals
+                        could not be made without losing uniqueness, or the
+                        result doesn't need the `hardest` technique.
+        """
+        allowed = None
+        if hardest is not None and hardest != "search":
+            allowed = TECHNIQUES[: TECHNIQUES.index(hardest) + 1]
+
+        solution = [board[i]["value"] for i in range(81)]
+        puzzle = list(solution)
+        removed = 0
+        # Cells already removed or pinned. A mirror pair comes up twice in
+        # the shuffled order, but only needs to be decided once.
+        settled = set()
+
+        for index in self.__random.sample(range(81), k=81):
+            pinned = len(settled) - removed
+            if removed == num_gaps or 81 - pinned < num_gaps:
+                break
+            cells = [index]
+            if symmetric:
+                cells = [i for i in {index, 80 - index} if i not in settled]
+            if not cells:
+                continue
+            if removed + len(cells) > num_gaps:
+                # Removals never shrink, so this pair can never fit again.
+                settled.update(cells)
+                continue
+
+            for i in cells:
+                puzzle[i] = 0
+            if allowed is not None:
+                grade = solver.grade_sudoku_board(puzzle, allowed, search=False)
+                too_hard = not grade["solved"]
+            else:
+                # The puzzle was unique before this step, so it stays unique
+                # unless a solution differs from the original in the new gaps.
+                too_hard = solver.has_alternative_solution(puzzle, solution, cells)
+            settled.update(cells)
+            if too_hard:
+                for i in cells:
+                    puzzle[i] = solution[i]
+            else:
+                removed += len(cells)
+
+        if removed < num_gaps:
+            return None
+        if hardest is not None:
+            easier = GRADES[: GRADES.index(hardest)]
+            if solver.grade_sudoku_board(puzzle, easier, search=False)["solved"]:
+                return None
+
+        board_copy = copy.deepcopy(board)
+        for i in range(81):
+            if not puzzle[i]:
+                board_copy[i]["state"] = "empty"
+                board_copy[i]["possibilities"] = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+        return board_copy
+
+    def __generate_unique_puzzle(self, num_gaps, symmetric, hardest=None):
+        """Generate a complete board and carve it into a uniquely solvable puzzle."""
+        solver = SudokuSolver()
+        for _ in range(self.__attempts):
+            complete_board = self.__new_complete_board()
+            board_with_gaps = self.__carve_unique_gaps(
+                complete_board, num_gaps, symmetric, solver, hardest
+            )
+            if board_with_gaps is not None:
+                return complete_board, board_with_gaps
+        raise ValueError("Unique puzzle generation failed after maximum attempts.")
+
     def __draw_board(self, attribute, data):
         """Print the Sudoku board."""
         output = ""
@@ -218,407 +585,1031 @@ class Sudoku:
         else:
             raise ValueError("Invalid dimension. Use 'one' or 'two'.")
 
+    def get_generation_stats(self):
+        """
+        Return how much work building this board took.
+
+        Returns:
+            dict: "grids" is the number of complete grids generated (more than
+                    one when unique carving had to start over), "backtracks"
+                    the cells undone by the "backtrack" method and "restarts"
+                    the grids abandoned and started again from scratch.
+        """
+        return dict(self.__generation_stats)
+
+    @classmethod
+    def from_boards(cls, board_gaps, board_solution):
+        """
+        Create a Sudoku from an already generated puzzle and its solution.
+
+        No generation or carving takes place, which makes this the cheap way
+        to build a Sudoku from a stored or pooled puzzle.
+
+        Parameters:
+            board_gaps (list): The puzzle as 81 values. Use 'X', None or 0
+                        for empty cells.
+            board_solution (list): The complete solution as 81 integers.
+
+        Returns:
+            Sudoku: A board with the given puzzle and solution.
+        """
+        if len(board_gaps) != 81 or len(board_solution) != 81:
+            raise ValueError("Input list must contain exactly 81 elements.")
+        sudoku = cls.__new__(cls)
+        sudoku.__method = None
+        sudoku.__random = random.Random()
+        sudoku.__generation_stats = {"grids": 0, "backtracks": 0, "restarts": 0}
+        sudoku.__board_metadata = {}
+        sudoku.__complete_board = sudoku.__metadata_from_grid(board_solution)
+        board_with_gaps = copy.deepcopy(sudoku.__complete_board)
+        for i, value in enumerate(board_gaps):
+            if value == "X" or not value:
+                board_with_gaps[i]["state"] = "empty"
+                board_with_gaps[i]["possibilities"] = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+        sudoku.__board_with_gaps = board_with_gaps
+        sudoku.__num_gaps = sum(
+            cell["state"] == "empty" for cell in board_with_gaps.values()
+        )
+        sudoku._update_possibilities(board_with_gaps)
+        return sudoku
+
+    @staticmethod
+    def __batch_seeds(count, seed):
+        """Derive one seed per puzzle from a batch's master seed."""
+        if seed is None:
+            seed = random.getrandbits(64)
+        return (f"{seed}:{index}" for index in range(count))
+
+    @staticmethod
+    def generate_many(
+        count,
+        gaps,
+        seed=None,
+        unique=False,
+        symmetric=False,
+        method="backtrack",
+        hardest=None,
+    ):
+        """
+        Generates Sudoku puzzles in this process.
+
+        Produces the same batch as generate_parallel for the same seed.
+
+        Parameters:
+            count (int): Number of puzzles to generate.
+            gaps (int): Number of empty cells in each puzzle.
+            seed: Master seed for the batch. None gives a random batch.
+            unique (bool): Passed to Sudoku, see its documentation.
+            symmetric (bool): Passed to Sudoku, see its documentation.
+            method (str): Passed to Sudoku, see its documentation.
+            hardest (str): Passed to Sudoku, see its documentation.
+
+        Yields:
+            tuple: (board_gaps, board_solution) 1D lists for each puzzle.
+        """
+        for puzzle_seed in Sudoku.__batch_seeds(count, seed):
+            sudoku = Sudoku(
+                gaps,
+                unique=unique,
+                symmetric=symmetric,
+                seed=puzzle_seed,
+                method=method,
+                hardest=hardest,
+            )
+            yield sudoku.get_board_gaps(), sudoku.get_board_solution()
+
+    @staticmethod
+    def generate_parallel(
+        count,
+        gaps,
+        seed=None,
+        workers=None,
+        chunksize=16,
+        unique=False,
+        symmetric=False,
+        method="backtrack",
+        hardest=None,
+    ):
+        """
+        Generates Sudoku puzzles across a pool of worker processes.
+
+        Every puzzle gets its own seed derived from the master seed and its
+        position in the batch, so a batch is reproducible from one seed
+        regardless of the number of workers or the chunk size.
+
+        Parameters:
+            count (int): Number of puzzles to generate.
+            gaps (int): Number of empty cells in each puzzle.
+            seed: Master seed for the batch. None gives a random batch.
+            workers (int): Number of worker processes, defaults to the CPU count.
+            chunksize (int): Number of puzzles dispatched to a worker at once.
+            unique (bool): Passed to Sudoku, see its documentation.
+            symmetric (bool): Passed to Sudoku, see its documentation.
+            method (str): Passed to Sudoku, see its documentation.
+            hardest (str): Passed to Sudoku, see its documentation.
+
+        Yields:
+            tuple: (board_gaps, board_solution) 1D lists for each puzzle, in
+                    the same format as get_board_gaps and get_board_solution.
+        """
+        options = (
+            (gaps, unique, symmetric, puzzle_seed, method, hardest)
+            for puzzle_seed in Sudoku.__batch_seeds(count, seed)
+        )
+        import multiprocessing
+
+        with multiprocessing.Pool(processes=workers) as pool:
+            for board_gaps, board_solution in pool.imap(
+                _generate_encoded_puzzle, options, chunksize
+            ):
+                yield (
+                    [value or "X" for value in decode_board(board_gaps)],
+                    decode_board(board_solution),
+                )
+
     @staticmethod
     def clear_screen():
         """Clear the console screen."""
         os.system("cls" if os.name == "nt" else "clear")
 
+
 class SudokuSolver:
     """Sudoku class for solving Sudoku puzzles."""
 
-    @staticmethod
-    def __convert_list_to_metadata(board_list):
+    def __init__(
+        self,
+        collect_stats: bool = False,
+        techniques=None,
+        cache_size: int = 0,
+        cache_symmetric: bool = False,
+    ):
         """
-        Converts a 1D list of Sudoku values into a metadata dictionary.
+        Initialize the SudokuSolver class and preallocate its board buffers.
+
+        Parameters:
+            collect_stats (bool): Record calls, wall time, eliminations and
+                        placements per technique. See get_stats.
+            techniques (iterable): Names from TECHNIQUES to use by default.
+                        None uses all of them.
+            cache_size (int): Keep the results of this many recent puzzles
+                        for solve_sudoku_board, least recently used first
+                        out. 0 disables the cache.
+            cache_symmetric (bool): On a cache miss, also look the puzzle up
+                        by its canonical form, so transformed copies of a
+                        cached puzzle hit too. Canonicalizing costs a few
+                        milliseconds, so this only pays off for hard puzzles.
+                        Boards with fewer than MIN_UNIQUE_GIVENS givens
+                        skip this lookup.
+        """
+        self.__values = [0] * 81
+        self.__candidates = [0] * 81
+        self.__row_used = [0] * 9
+        self.__col_used = [0] * 9
+        self.__box_used = [0] * 9
+        # Change tracking: every candidate change stamps the cell's three units
+        # with the current clock, and each technique remembers the clock of its
+        # last run, so it only re-examines units changed since then.
+        self.__clock = 0
+        self.__unit_stamps = [0] * 27
+        self.__last_seen = {}
+        self.__collect_stats = collect_stats
+        self.__stats = {}
+        self.__total_stats = {}
+        # Exact puzzles are keyed by their 81-character string and canonical
+        # forms by their bytes, so both kinds of entry share one LRU order.
+        self.__cache = collections.OrderedDict()
+        self.__cache_size = cache_size
+        self.__cache_symmetric = cache_symmetric
+        self.__cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.__technique_methods = {
+            "hidden_singles_box": self.__process_unique_possibilities_in_box,
+            "hidden_singles_row": self.__process_unique_possibilities_in_row,
+            "hidden_singles_column": self.__process_unique_possibilities_in_column,
+            "naked_singles": self.__check_new_value,
+            "naked_pairs": self.__process_naked_pairs,
+            "hidden_pairs": self.__process_hidden_pairs,
+            "x_wing": self.__process_x_wing,
+            "swordfish": self.__process_swordfish,
+        }
+        self.__pipeline = self.__build_pipeline(
+            TECHNIQUES if techniques is None else techniques
+        )
+
+    def __build_pipeline(self, techniques):
+        """
+        Return the (name, method) pairs of the chosen techniques in cost order.
+
+        Parameters:
+            techniques (iterable): Names from TECHNIQUES, in any order.
+        """
+        techniques = set(techniques)
+        unknown = techniques.difference(TECHNIQUES)
+        if unknown:
+            raise ValueError(
+                f"Unknown techniques: {', '.join(sorted(unknown))}. "
+                f"Use names from {', '.join(TECHNIQUES)}."
+            )
+        return tuple(
+            (name, self.__technique_methods[name])
+            for name in TECHNIQUES
+            if name in techniques
+        )
+
+    def __load_board(self, board_list):
+        """
+        Loads a 1D list of Sudoku values into the bitmask board state.
+
+        The preallocated buffers are reset in place, so loading a board does
+        not allocate new state.
 
         Parameters:
             board_list (list): A list of 81 values representing the Sudoku board.
-                            Use 'X' or None for empty cells.
+                            Use 'X', None or 0 for empty cells.
 
         Returns:
-            dict: A dictionary containing metadata for each cell.
+            bool: False if the givens already break the Sudoku rules.
         """
         if len(board_list) != 81:
             raise ValueError("Input list must contain exactly 81 elements.")
 
-        metadata = {}
+        values = self.__values
+        candidates = self.__candidates
+        row_used = self.__row_used
+        col_used = self.__col_used
+        box_used = self.__box_used
+        values[:] = EMPTY_BOARD
+        self.__clock += 1
+        self.__unit_stamps[:] = (self.__clock,) * 27
+        row_used[:] = EMPTY_UNITS
+        col_used[:] = EMPTY_UNITS
+        box_used[:] = EMPTY_UNITS
+
         for i, value in enumerate(board_list):
-            metadata[i] = {
-                "index": i,
-                "col": i % 9,
-                "row": i // 9,
-                "value": 0 if value == "X" or value is None else value,
-                "box": (i // 9 // 3) * 3 + (i % 9) // 3,
-                "possibilities": (
-                    []
-                    if value != "X" and value is not None
-                    else [1, 2, 3, 4, 5, 6, 7, 8, 9]
-                ),
-                "state": "checked" if value != "X" and value is not None else "empty",
-            }
-        return metadata
+            if value == "X" or value is None or value == 0:
+                continue
+            bit = DIGIT_BIT[value]
+            row, col, box = CELL_ROW[i], CELL_COL[i], CELL_BOX[i]
+            if (row_used[row] | col_used[col] | box_used[box]) & bit:
+                return False
+            values[i] = value
+            row_used[row] |= bit
+            col_used[col] |= bit
+            box_used[box] |= bit
 
-    def __remove_value_from_related_cells(self, row, column, box, number):
-        """Removes a value from possibilities in related rows, columns, and boxes."""
         for i in range(81):
-            if number in self.__board_metadata_solver[i]["possibilities"]:
-                if (
-                    self.__board_metadata_solver[i]["row"] == row
-                    or self.__board_metadata_solver[i]["col"] == column
-                    or self.__board_metadata_solver[i]["box"] == box
-                ):
-                    self.__board_metadata_solver[i]["possibilities"].remove(number)
+            if values[i]:
+                candidates[i] = 0
+            else:
+                candidates[i] = ALL_DIGITS_MASK & ~(
+                    row_used[CELL_ROW[i]]
+                    | col_used[CELL_COL[i]]
+                    | box_used[CELL_BOX[i]]
+                )
+        return True
+
+    def __place_value(self, index, number):
+        """Writes a value into a cell and updates the unit masks and related cells."""
+        bit = DIGIT_BIT[number]
+        row, col, box = CELL_ROW[index], CELL_COL[index], CELL_BOX[index]
+        self.__values[index] = number
+        self.__candidates[index] = 0
+        self.__row_used[row] |= bit
+        self.__col_used[col] |= bit
+        self.__box_used[box] |= bit
+        self.__mark_changed(index)
+        self.__remove_value_from_related_cells(index, bit)
+
+    def __remove_value_from_related_cells(self, index, bit):
+        """Removes a value from possibilities in related rows, columns, and boxes."""
+        candidates = self.__candidates
+        stamps = self.__unit_stamps
+        clock = self.__clock
+        for i in PEERS[index]:
+            if candidates[i] & bit:
+                candidates[i] &= ~bit
+                row, col, box = CELL_UNIT_IDS[i]
+                stamps[row] = stamps[col] = stamps[box] = clock
+
+    def __mark_changed(self, index):
+        """Marks the row, column, and box of a changed cell for re-examination."""
+        row, col, box = CELL_UNIT_IDS[index]
+        stamps = self.__unit_stamps
+        stamps[row] = stamps[col] = stamps[box] = self.__clock
+
+    def __changed_units(self, name, unit_ids):
+        """
+        Return the units changed since a technique last examined them.
+
+        Parameters:
+            name (str): The technique asking, used to remember its last run.
+            unit_ids (iterable): Positions in UNITS the technique works on.
+
+        Returns:
+            list: The positions in UNITS to re-examine.
+        """
+        since = self.__last_seen.get(name, -1)
+        self.__last_seen[name] = self.__clock
+        self.__clock += 1
+        stamps = self.__unit_stamps
+        return [unit_id for unit_id in unit_ids if stamps[unit_id] > since]
+
+    def __process_unique_possibilities(self, group_type):
+        """Finds and processes cells with unique possibilities within a group type."""
+        progress = False
+        candidates = self.__candidates
+        for unit_id in self.__changed_units(group_type, GROUP_UNIT_IDS[group_type]):
+            indices = UNITS[unit_id]
+            seen_once = seen_twice = 0
+            for idx in indices:
+                seen_twice |= seen_once & candidates[idx]
+                seen_once |= candidates[idx]
+
+            for n in MASK_DIGITS[seen_once & ~seen_twice]:
+                bit = DIGIT_BIT[n]
+                for idx in indices:
+                    if candidates[idx] & bit:
+                        self.__place_value(idx, n)
+                        progress = True
+                        break
+        return progress
 
     def __process_unique_possibilities_in_box(self):
         """Finds and processes cells with unique possibilities within boxes."""
-        for k in range(9):
-            obj = {i: {"value": 0, "possibilities": []} for i in range(1, 10)}
-            box_start = (k // 3) * 27 + (k % 3) * 3
-            box_indices = [box_start + (j // 3) * 9 + (j % 3) for j in range(9)]
-
-            for idx in box_indices:
-                for i in range(1, 10):
-                    if i in self.__board_metadata_solver[idx]["possibilities"]:
-                        obj[i]["value"] += 1
-                        obj[i]["possibilities"].append(idx)
-
-            for i in range(1, 10):
-                if obj[i]["value"] == 1:
-                    unique_idx = obj[i]["possibilities"][0]
-                    self.__board_metadata_solver[unique_idx]["value_new"] = i
-                    self.__board_metadata_solver[unique_idx]["possibilities"] = []
-                    self.__remove_value_from_related_cells(
-                        self.__board_metadata_solver[unique_idx]["row"],
-                        self.__board_metadata_solver[unique_idx]["col"],
-                        self.__board_metadata_solver[unique_idx]["box"],
-                        i,
-                    )
+        return self.__process_unique_possibilities("box")
 
     def __process_unique_possibilities_in_row(self):
         """Finds and processes cells with unique possibilities within rows."""
-        for r in range(9):
-            obj = {i: {"value": 0, "possibilities": []} for i in range(1, 10)}
-            row_start = r * 9
-            for i in range(9):
-                for n in range(1, 10):
-                    if (
-                        n
-                        in self.__board_metadata_solver[row_start + i]["possibilities"]
-                    ):
-                        obj[n]["value"] += 1
-                        obj[n]["possibilities"].append(row_start + i)
-
-            for n in range(1, 10):
-                if obj[n]["value"] == 1:
-                    unique_idx = obj[n]["possibilities"][0]
-                    self.__board_metadata_solver[unique_idx]["value_new"] = n
-                    self.__board_metadata_solver[unique_idx]["possibilities"] = []
-                    self.__remove_value_from_related_cells(
-                        self.__board_metadata_solver[unique_idx]["row"],
-                        self.__board_metadata_solver[unique_idx]["col"],
-                        self.__board_metadata_solver[unique_idx]["box"],
-                        n,
-                    )
+        return self.__process_unique_possibilities("row")
 
     def __process_unique_possibilities_in_column(self):
         """Finds and processes cells with unique possibilities within columns."""
-        for c in range(9):
-            obj = {i: {"value": 0, "possibilities": []} for i in range(1, 10)}
-            for r in range(9):
-                idx = r * 9 + c
-                for n in range(1, 10):
-                    if n in self.__board_metadata_solver[idx]["possibilities"]:
-                        obj[n]["value"] += 1
-                        obj[n]["possibilities"].append(idx)
-
-            for n in range(1, 10):
-                if obj[n]["value"] == 1:
-                    unique_idx = obj[n]["possibilities"][0]
-                    self.__board_metadata_solver[unique_idx]["value_new"] = n
-                    self.__board_metadata_solver[unique_idx]["possibilities"] = []
-                    self.__remove_value_from_related_cells(
-                        self.__board_metadata_solver[unique_idx]["row"],
-                        self.__board_metadata_solver[unique_idx]["col"],
-                        self.__board_metadata_solver[unique_idx]["box"],
-                        n,
-                    )
+        return self.__process_unique_possibilities("col")
 
     def __process_naked_pairs(self):
         """Identifies and processes naked pairs in rows, columns, and boxes."""
-        for group_type in ["row", "col", "box"]:
-            for i in range(9):
-                candidates = []
-                if group_type == "row":
-                    indices = [i * 9 + j for j in range(9)]
-                elif group_type == "col":
-                    indices = [j * 9 + i for j in range(9)]
-                else:
-                    box_start = (i // 3) * 27 + (i % 3) * 3
-                    indices = [box_start + (j // 3) * 9 + (j % 3) for j in range(9)]
-
-                for idx in indices:
-                    if len(self.__board_metadata_solver[idx]["possibilities"]) == 2:
-                        candidates.append(
-                            (
-                                idx,
-                                set(self.__board_metadata_solver[idx]["possibilities"]),
-                            )
-                        )
-
-                for idx1, pair1 in candidates:
-                    for idx2, pair2 in candidates:
-                        if idx1 != idx2 and pair1 == pair2:
-                            for idx in indices:
-                                if (
-                                    idx != idx1
-                                    and idx != idx2
-                                    and len(
-                                        self.__board_metadata_solver[idx][
-                                            "possibilities"
-                                        ]
-                                    )
-                                    > 0
-                                ):
-                                    self.__board_metadata_solver[idx][
-                                        "possibilities"
-                                    ] = [
-                                        n
-                                        for n in self.__board_metadata_solver[idx][
-                                            "possibilities"
-                                        ]
-                                        if n not in pair1
-                                    ]
+        progress = False
+        candidates = self.__candidates
+        for unit_id in self.__changed_units("naked_pairs", range(27)):
+            indices = UNITS[unit_id]
+            seen_pairs = set()
+            for idx in indices:
+                pair = candidates[idx]
+                if BIT_COUNT[pair] != 2:
+                    continue
+                if pair not in seen_pairs:
+                    seen_pairs.add(pair)
+                    continue
+                for other in indices:
+                    mask = candidates[other]
+                    if mask != pair and mask & pair:
+                        candidates[other] = mask & ~pair
+                        self.__mark_changed(other)
+                        progress = True
+        return progress
 
-    def __process_naked_pairs(self):
+    def __process_hidden_pairs(self):
         """Identifies and processes hidden pairs in rows, columns, and boxes."""
-        for group_type in ["row", "col", "box"]:
-            for i in range(9):
-                if group_type == "row":
-                    indices = [i * 9 + j for j in range(9)]
-                elif group_type == "col":
-                    indices = [j * 9 + i for j in range(9)]
-                else:
-                    box_start = (i // 3) * 27 + (i % 3) * 3
-                    indices = [box_start + (j // 3) * 9 + (j % 3) for j in range(9)]
+        progress = False
+        candidates = self.__candidates
+        for unit_id in self.__changed_units("hidden_pairs", range(27)):
+            indices = UNITS[unit_id]
+            # For every digit, a 9-bit mask of the unit positions holding it.
+            occurrences = [0] * 10
+            for position, idx in enumerate(indices):
+                for n in MASK_DIGITS[candidates[idx]]:
+                    occurrences[n] |= 1 << position
 
-                occurrences = {n: [] for n in range(1, 10)}
-                for idx in indices:
-                    for n in self.__board_metadata_solver[idx]["possibilities"]:
-                        occurrences[n].append(idx)
+            for x in range(1, 10):
+                if BIT_COUNT[occurrences[x]] != 2:
+                    continue
+                for y in range(x + 1, 10):
+                    if occurrences[y] != occurrences[x]:
+                        continue
+                    pair = DIGIT_BIT[x] | DIGIT_BIT[y]
+                    for position in MASK_DIGITS[occurrences[x]]:
+                        idx = indices[position - 1]
+                        if candidates[idx] != pair:
+                            candidates[idx] = pair
+                            self.__mark_changed(idx)
+                            progress = True
+        return progress
 
-                for pair in [(x, y) for x in range(1, 10) for y in range(x + 1, 10)]:
-                    if len(set(occurrences[pair[0]] + occurrences[pair[1]])) == 2:
-                        shared_indices = set(
-                            occurrences[pair[0]] + occurrences[pair[1]]
-                        )
-                        for idx in shared_indices:
-                            self.__board_metadata_solver[idx]["possibilities"] = [
-                                n
-                                for n in self.__board_metadata_solver[idx][
-                                    "possibilities"
-                                ]
-                                if n in pair
-                            ]
+    def __digit_positions(self, bit):
+        """Return per-row column masks and per-column row masks of a digit."""
+        row_positions = [0] * 9
+        col_positions = [0] * 9
+        candidates = self.__candidates
+        for i in range(81):
+            if candidates[i] & bit:
+                row_positions[CELL_ROW[i]] |= 1 << CELL_COL[i]
+                col_positions[CELL_COL[i]] |= 1 << CELL_ROW[i]
+        return row_positions, col_positions
+
+    def __eliminate_fish(self, bit, lines, cover, by_row):
+        """Removes a digit from the covered lines outside of the fish lines."""
+        progress = False
+        candidates = self.__candidates
+        for line in range(9):
+            if line in lines:
+                continue
+            for cross in MASK_DIGITS[cover]:
+                idx = line * 9 + cross - 1 if by_row else (cross - 1) * 9 + line
+                if candidates[idx] & bit:
+                    candidates[idx] &= ~bit
+                    self.__mark_changed(idx)
+                    progress = True
+        return progress
 
     def __process_x_wing(self):
         """Identifies and processes X-Wing patterns in rows and columns."""
+        progress = False
+        if not self.__changed_units("x_wing", range(27)):
+            return progress
         for digit in range(1, 10):
-            # Check rows
-            row_positions = []
-            for r in range(9):
-                positions = [
-                    c
-                    for c in range(9)
-                    if digit in self.__board_metadata_solver[r * 9 + c]["possibilities"]
-                ]
-                if len(positions) == 2:
-                    row_positions.append((r, positions))
-
-            for (r1, p1), (r2, p2) in [
-                (x, y) for x in row_positions for y in row_positions if x != y
-            ]:
-                if p1 == p2:
-                    for c in p1:
-                        for r in range(9):
-                            if (
-                                r != r1
-                                and r != r2
-                                and digit
-                                in self.__board_metadata_solver[r * 9 + c][
-                                    "possibilities"
-                                ]
-                            ):
-                                self.__board_metadata_solver[r * 9 + c][
-                                    "possibilities"
-                                ].remove(digit)
-
-            # Check columns
-            col_positions = []
-            for c in range(9):
-                positions = [
-                    r
-                    for r in range(9)
-                    if digit in self.__board_metadata_solver[r * 9 + c]["possibilities"]
-                ]
-                if len(positions) == 2:
-                    col_positions.append((c, positions))
-
-            for (c1, p1), (c2, p2) in [
-                (x, y) for x in col_positions for y in col_positions if x != y
-            ]:
-                if p1 == p2:
-                    for r in p1:
-                        for c in range(9):
-                            if (
-                                c != c1
-                                and c != c2
-                                and digit
-                                in self.__board_metadata_solver[r * 9 + c][
-                                    "possibilities"
-                                ]
-                            ):
-                                self.__board_metadata_solver[r * 9 + c][
-                                    "possibilities"
-                                ].remove(digit)
+            bit = DIGIT_BIT[digit]
+            for by_row, positions in zip(
+                (True, False), self.__digit_positions(bit)
+            ):
+                lines = [line for line in range(9) if BIT_COUNT[positions[line]] == 2]
+                for a, line1 in enumerate(lines):
+                    for line2 in lines[a + 1 :]:
+                        if positions[line1] == positions[line2]:
+                            progress |= self.__eliminate_fish(
+                                bit, (line1, line2), positions[line1], by_row
+                            )
+        return progress
 
     def __process_swordfish(self):
         """Identifies and processes Swordfish patterns in rows and columns."""
+        progress = False
+        if not self.__changed_units("swordfish", range(27)):
+            return progress
         for digit in range(1, 10):
-            # Check rows
-            row_candidates = {
-                r: [
-                    c
-                    for c in range(9)
-                    if digit in self.__board_metadata_solver[r * 9 + c]["possibilities"]
+            bit = DIGIT_BIT[digit]
+            for by_row, positions in zip(
+                (True, False), self.__digit_positions(bit)
+            ):
+                lines = [
+                    line for line in range(9) if 2 <= BIT_COUNT[positions[line]] <= 3
                 ]
-                for r in range(9)
-            }
-            rows_with_candidates = [
-                r for r, cols in row_candidates.items() if 2 <= len(cols) <= 3
-            ]
-
-            for r1, r2, r3 in [
-                (x, y, z)
-                for x in rows_with_candidates
-                for y in rows_with_candidates
-                for z in rows_with_candidates
-                if x < y < z
-            ]:
-                common_cols = (
-                    set(row_candidates[r1])
-                    & set(row_candidates[r2])
-                    & set(row_candidates[r3])
-                )
-                if len(common_cols) == 3:
-                    for r in range(9):
-                        if r not in [r1, r2, r3]:
-                            for c in common_cols:
-                                if (
-                                    digit
-                                    in self.__board_metadata_solver[r * 9 + c][
-                                        "possibilities"
-                                    ]
-                                ):
-                                    self.__board_metadata_solver[r * 9 + c][
-                                        "possibilities"
-                                    ].remove(digit)
-
-            # Check columns
-            col_candidates = {
-                c: [
-                    r
-                    for r in range(9)
-                    if digit in self.__board_metadata_solver[r * 9 + c]["possibilities"]
-                ]
-                for c in range(9)
-            }
-            cols_with_candidates = [
-                c for c, rows in col_candidates.items() if 2 <= len(rows) <= 3
-            ]
-
-            for c1, c2, c3 in [
-                (x, y, z)
-                for x in cols_with_candidates
-                for y in cols_with_candidates
-                for z in cols_with_candidates
-                if x < y < z
-            ]:
-                common_rows = (
-                    set(col_candidates[c1])
-                    & set(col_candidates[c2])
-                    & set(col_candidates[c3])
-                )
-                if len(common_rows) == 3:
-                    for c in range(9):
-                        if c not in [c1, c2, c3]:
-                            for r in common_rows:
-                                if (
-                                    digit
-                                    in self.__board_metadata_solver[r * 9 + c][
-                                        "possibilities"
-                                    ]
-                                ):
-                                    self.__board_metadata_solver[r * 9 + c][
-                                        "possibilities"
-                                    ].remove(digit)
+                for a, line1 in enumerate(lines):
+                    for b, line2 in enumerate(lines[a + 1 :], a + 1):
+                        cover12 = positions[line1] | positions[line2]
+                        if BIT_COUNT[cover12] > 3:
+                            continue
+                        for line3 in lines[b + 1 :]:
+                            cover = cover12 | positions[line3]
+                            if BIT_COUNT[cover] == 3:
+                                progress |= self.__eliminate_fish(
+                                    bit, (line1, line2, line3), cover, by_row
+                                )
+        return progress
 
     def __check_new_value(self):
         """Checks for cells with a single possibility and resolves them."""
         progress = False
+        candidates = self.__candidates
+        # Every changed cell stamps its row, so checking changed rows is enough.
+        for unit_id in self.__changed_units("naked_singles", range(9)):
+            for i in UNITS[unit_id]:
+                if BIT_COUNT[candidates[i]] == 1 and not self.__values[i]:
+                    self.__place_value(i, MASK_DIGITS[candidates[i]][0])
+                    progress = True
+        return progress
+
+    def __has_contradiction(self):
+        """Checks for empty cells or units that have run out of possibilities."""
+        values = self.__values
+        candidates = self.__candidates
         for i in range(81):
-            if (
-                len(self.__board_metadata_solver[i]["possibilities"]) == 1
-                and self.__board_metadata_solver[i]["state"] == "empty"
-            ):
-                value = self.__board_metadata_solver[i]["possibilities"].pop()
-                self.__board_metadata_solver[i]["value_new"] = value
-                self.__remove_value_from_related_cells(
-                    self.__board_metadata_solver[i]["row"],
-                    self.__board_metadata_solver[i]["col"],
-                    self.__board_metadata_solver[i]["box"],
-                    value,
-                )
-                progress = True
-        return not progress
-
-    def __solver(self):
-        """Solves the Sudoku puzzle using logical deduction."""
-        iterations = 0
-        while True:
-            self.__process_unique_possibilities_in_box()
-            self.__process_unique_possibilities_in_row()
-            self.__process_unique_possibilities_in_column()
-
-            self.__process_naked_pairs()
-            self.__process_naked_pairs()
-            self.__process_swordfish()
-            self.__process_x_wing()
-
-            if self.__check_new_value():
-                break
-            iterations += 1
-            if iterations > 50:  # Prevent infinite loops
-                break
+            if not values[i] and not candidates[i]:
+                return True
+        for unit in UNITS:
+            covered = 0
+            for idx in unit:
+                covered |= candidates[idx] | DIGIT_BIT[values[idx]]
+            if covered != ALL_DIGITS_MASK:
+                return True
+        return False
 
-    def solve_sudoku_board(self, board_list):
-        self.__board_metadata_solver = self.__convert_list_to_metadata(board_list)
-        Sudoku._update_possibilities(self.__board_metadata_solver)
-        self.__solver()
-
-        is_solved = True
-        for val in self.__board_metadata_solver.values():
-            if val["state"] == "empty" and not val.get("value_new"):
-                is_solved = False
-
-        if is_solved:
-            board_metadata_solution = copy.deepcopy(self.__board_metadata_solver)
-            for val in board_metadata_solution.values():
-                if val["state"] == "empty":
-                    val["value"] = val["value_new"]
-                    val["state"] = "checked"
-                    if "value_new" in val:
-                        del val["value_new"]
-            
-            return [cell["value"] for cell in board_metadata_solution.values()]
-        else:
-            return "This sudoku doesn't have single solution."
+    def __solver(self, pipeline):
+        """
+        Solves the Sudoku puzzle using logical deduction.
+
+        Techniques run from the cheapest to the most expensive. As soon as one
+        of them makes progress the pipeline restarts from the cheapest, so
+        costly techniques only run once every cheaper one has stalled.
+
+        Parameters:
+            pipeline (tuple): (name, method) pairs in cost order.
+
+        Returns:
+            tuple: The number of steps that made progress and the position in
+                    `pipeline` of the most expensive of them, or -1.
+        """
+        steps = 0
+        hardest = -1
+        position = 0
+        while position < len(pipeline):
+            name, technique = pipeline[position]
+            if self.__collect_stats:
+                progress = self.__run_with_stats(name, technique)
+            else:
+                progress = technique()
+            if progress:
+                steps += 1
+                hardest = max(hardest, position)
+                position = 0
+            else:
+                position += 1
+        return steps, hardest
+
+    def __record_stats(self, name, elapsed, placements, eliminations):
+        """Add one technique call to the stats of the current solve and the totals."""
+        for stats in (self.__stats, self.__total_stats):
+            entry = stats.get(name)
+            if entry is None:
+                entry = stats[name] = {
+                    "calls": 0,
+                    "time": 0.0,
+                    "placements": 0,
+                    "eliminations": 0,
+                }
+            entry["calls"] += 1
+            entry["time"] += elapsed
+            entry["placements"] += placements
+            entry["eliminations"] += eliminations
+
+    def __count_changes(self, values_before, candidates_before):
+        """
+        Count the cells filled and the candidates eliminated since a snapshot.
+
+        Candidates that only went away because their cell or a peer was
+        filled with that digit belong to the placement, so they are not
+        counted as eliminations.
+
+        Returns:
+            tuple: The number of placements and of eliminations.
+        """
+        values = self.__values
+        candidates = self.__candidates
+        placed = [i for i in range(81) if values[i] and not values_before[i]]
+        eliminations = 0
+        for i in range(81):
+            if values[i]:
+                continue
+            removed = candidates_before[i] & ~candidates[i]
+            if removed and placed:
+                for peer in PEERS[i]:
+                    if values[peer] and not values_before[peer]:
+                        removed &= ~DIGIT_BIT[values[peer]]
+            eliminations += BIT_COUNT[removed]
+        return len(placed), eliminations
+
+    def __run_with_stats(self, name, technique):
+        """Run a technique and record its calls, time and board changes."""
+        values_before = self.__values[:]
+        candidates_before = self.__candidates[:]
+        start = time.perf_counter()
+        progress = technique()
+        elapsed = time.perf_counter() - start
+        placements, eliminations = self.__count_changes(
+            values_before, candidates_before
+        )
+        self.__record_stats(name, elapsed, placements, eliminations)
+        return progress
+
+    def get_stats(self, total: bool = False):
+        """
+        Return the per-technique statistics collected with collect_stats=True.
+
+        Parameters:
+            total (bool): Return the totals over every solve instead of the
+                        most recent solve only.
+
+        Returns:
+            dict: Technique name mapped to its calls, time (seconds),
+                  placements and eliminations. "search" covers the
+                  backtracking fallback.
+        """
+        return copy.deepcopy(self.__total_stats if total else self.__stats)
+
+    def reset_stats(self):
+        """Clear the statistics of the most recent solve and the totals."""
+        self.__stats = {}
+        self.__total_stats = {}
+
+    def __save_state(self):
+        """Return a snapshot of the board state for backtracking."""
+        return (
+            self.__values[:],
+            self.__candidates[:],
+            self.__row_used[:],
+            self.__col_used[:],
+            self.__box_used[:],
+            self.__unit_stamps[:],
+        )
+
+    def __restore_state(self, state):
+        """Restore a snapshot taken by __save_state in place."""
+        (
+            self.__values[:],
+            self.__candidates[:],
+            self.__row_used[:],
+            self.__col_used[:],
+            self.__box_used[:],
+            self.__unit_stamps[:],
+        ) = state
+
+    def __propagate(self):
+        """
+        Applies naked and hidden singles until they stall.
+
+        Returns:
+            bool: False if the board ended up in a contradiction.
+        """
+        progress = True
+        while progress:
+            progress = self.__process_unique_possibilities_in_box()
+            progress |= self.__process_unique_possibilities_in_row()
+            progress |= self.__process_unique_possibilities_in_column()
+            progress |= self.__check_new_value()
+        return not self.__has_contradiction()
+
+    def __backtrack(self, solutions, limit):
+        """Guesses on the cell with the fewest possibilities (MRV) and recurses."""
+        if not self.__propagate():
+            return
+
+        best_index = None
+        best_count = 10
+        values = self.__values
+        candidates = self.__candidates
+        for i in range(81):
+            if not values[i] and BIT_COUNT[candidates[i]] < best_count:
+                best_index = i
+                best_count = BIT_COUNT[candidates[i]]
+                if best_count == 2:
+                    break
+
+        if best_index is None:
+            solutions.append(list(values))
+            return
+
+        state = self.__save_state()
+        for number in MASK_DIGITS[candidates[best_index]]:
+            self.__place_value(best_index, number)
+            self.__backtrack(solutions, limit)
+            if len(solutions) >= limit:
+                return
+            self.__restore_state(state)
+
+    def __search(self, limit):
+        """
+        Searches the current board state for solutions by backtracking.
+
+        Parameters:
+            limit (int): Stop as soon as this many solutions have been found.
+
+        Returns:
+            list: Up to `limit` solved boards as lists of 81 integers.
+        """
+        solutions = []
+        self.__backtrack(solutions, limit)
+        return solutions
+
+    def __is_valid_solution(self):
+        """Checks that every row, column, and box holds each digit exactly once."""
+        for unit in UNITS:
+            used = 0
+            for idx in unit:
+                if not self.__values[idx]:
+                    return False
+                used |= DIGIT_BIT[self.__values[idx]]
+            if used != ALL_DIGITS_MASK:
+                return False
+        return True
+
+    def has_alternative_solution(self, board_list, solution, indices):
+        """
+        Checks whether a puzzle can be solved differently at the given cells.
+
+        Parameters:
+            board_list (list): A list of 81 values representing the Sudoku board.
+                            Use 'X', None or 0 for empty cells.
+            solution (list): A known solution of the puzzle as 81 integers.
+            indices (list): Empty cells to test against the known solution.
+
+        Returns:
+            bool: True if some solution differs from `solution` in `indices`.
+        """
+        for index in indices:
+            if not self.__load_board(board_list):
+                return False
+            self.__candidates[index] &= ~DIGIT_BIT[solution[index]]
+            if self.__search(1):
+                return True
+        return False
+
+    def count_solutions(self, board_list, limit=2):
+        """
+        Counts the solutions of a Sudoku puzzle, stopping early at a limit.
+
+        Parameters:
+            board_list (list): A list of 81 values representing the Sudoku board.
+                            Use 'X', None or 0 for empty cells.
+            limit (int): Stop searching once this many solutions are found.
+                        The default of 2 is enough to check uniqueness.
+
+        Returns:
+            int: The number of solutions found, at most `limit`.
+        """
+        return len(self.search_solutions(board_list, limit))
+
+    def search_solutions(self, board_list, limit=2):
+        """
+        Finds solutions by backtracking search alone, skipping the logical
+        techniques. Cheaper than solve_sudoku_board for boards that singles
+        have already taken as far as they can.
+
+        Parameters:
+            board_list (list): A list of 81 values representing the Sudoku board.
+                            Use 'X', None or 0 for empty cells.
+            limit (int): Stop searching once this many solutions are found.
+
+        Returns:
+            list: Up to `limit` solved boards as lists of 81 integers.
+        """
+        if not self.__load_board(board_list):
+            return []
+        return self.__search(limit)
+
+    def solve_sudoku_board(self, board_list, techniques=None):
+        """
+        Solves a Sudoku puzzle given as a 1D list.
+
+        Logical techniques run first; if they stall, a backtracking search
+        finishes the board and confirms the solution is unique. With a
+        cache_size, repeated puzzles are answered from the solution cache.
+
+        Parameters:
+            board_list (list): A list of 81 values representing the Sudoku board.
+                            Use 'X', None or 0 for empty cells.
+            techniques (iterable): Names from TECHNIQUES to use for this call
+                            instead of the solver's default set.
+
+        Returns:
+            list | str: The solved board as a list of 81 integers, or a message
+                        if the puzzle doesn't have a single solution.
+        """
+        pipeline = self.__pipeline
+        if techniques is not None:
+            pipeline = self.__build_pipeline(techniques)
+
+        self.__stats = {}
+        if not self.__cache_size:
+            return self.__solve_board(board_list, pipeline)
+
+        if len(board_list) != 81:
+            raise ValueError("Input list must contain exactly 81 elements.")
+        key = encode_board(board_list)
+        if key in self.__cache:
+            self.__cache_stats["hits"] += 1
+            self.__cache.move_to_end(key)
+            solution = self.__cache[key]
+            return UNSOLVABLE_MESSAGE if solution is None else list(solution)
+
+        # Sparse boards are the slowest to canonicalize and can't be unique,
+        # so they are only cached by their exact string.
+        symmetric = (
+            self.__cache_symmetric and 81 - key.count("0") >= MIN_UNIQUE_GIVENS
+        )
+        if symmetric:
+            canonical, transform = canonicalize(board_list)
+            canonical_key = bytes(canonical)
+            if canonical_key in self.__cache:
+                self.__cache_stats["hits"] += 1
+                self.__cache.move_to_end(canonical_key)
+                solution = self.__cache[canonical_key]
+                if solution is not None:
+                    solution = invert_transform(solution, transform)
+                self.__cache_put(key, solution)
+                return UNSOLVABLE_MESSAGE if solution is None else list(solution)
+
+        self.__cache_stats["misses"] += 1
+        result = self.__solve_board(board_list, pipeline)
+        solution = None if isinstance(result, str) else tuple(result)
+        self.__cache_put(key, solution)
+        if symmetric:
+            if solution is not None:
+                solution = tuple(apply_transform(solution, transform))
+            self.__cache_put(canonical_key, solution)
+        return result
+
+    def __cache_put(self, key, solution):
+        """Store a result in the cache, evicting the least recently used one."""
+        self.__cache[key] = solution
+        self.__cache.move_to_end(key)
+        while len(self.__cache) > self.__cache_size:
+            self.__cache.popitem(last=False)
+            self.__cache_stats["evictions"] += 1
+
+    def get_cache_stats(self):
+        """
+        Return the solution cache counters.
+
+        Returns:
+            dict: "hits", "misses" and "evictions" since the last clear, and
+                  the current number of entries in "size".
+        """
+        return {**self.__cache_stats, "size": len(self.__cache)}
+
+    def clear_cache(self):
+        """Empty the solution cache and reset its counters."""
+        self.__cache.clear()
+        self.__cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __solve_board(self, board_list, pipeline):
+        """Solve a board with a technique pipeline; see solve_sudoku_board."""
+        if self.__load_board(board_list):
+            self.__solver(pipeline)
+            if self.__is_valid_solution():
+                return list(self.__values)
+
+            if not self.__has_contradiction():
+                if self.__collect_stats:
+                    filled = 81 - self.__values.count(0)
+                    start = time.perf_counter()
+                solutions = self.__search(limit=2)
+                if self.__collect_stats:
+                    placements = 81 - filled if len(solutions) == 1 else 0
+                    elapsed = time.perf_counter() - start
+                    self.__record_stats("search", elapsed, placements, 0)
+                if len(solutions) == 1:
+                    return solutions[0]
+
+        return UNSOLVABLE_MESSAGE
+
+    def grade_sudoku_board(self, board_list, techniques=None, search=True):
+        """
+        Rates a Sudoku puzzle by the hardest technique needed to solve it.
+
+        Techniques run in cost order and every one that makes progress sends
+        the solver back to the cheapest, so the most expensive technique that
+        ever made progress is the one the puzzle really needs.
+
+        Parameters:
+            board_list (list): A list of 81 values representing the Sudoku board.
+                            Use 'X', None or 0 for empty cells.
+            techniques (iterable): Names from TECHNIQUES to grade with instead
+                            of the solver's default set.
+            search (bool): Run the backtracking search when the techniques
+                            stall. Without it such puzzles are reported with
+                            search=True and solved=False.
+
+        Returns:
+            dict: "level" from TECHNIQUE_LEVELS (None if the puzzle doesn't
+                  have a single solution), the "hardest" logical technique
+                  used (None if no technique was needed), the number of
+                  "steps" that made progress, whether "search" was needed
+                  and whether the puzzle was "solved".
+        """
+        pipeline = self.__pipeline
+        if techniques is not None:
+            pipeline = self.__build_pipeline(techniques)
+
+        grade = {
+            "level": None,
+            "hardest": None,
+            "steps": 0,
+            "search": False,
+            "solved": False,
+        }
+        if not self.__load_board(board_list):
+            return grade
+
+        steps, hardest = self.__solver(pipeline)
+        grade["steps"] = steps
+        if hardest >= 0:
+            grade["hardest"] = pipeline[hardest][0]
+
+        if self.__is_valid_solution():
+            grade["solved"] = True
+        elif not self.__has_contradiction():
+            grade["search"] = True
+            if search:
+                grade["solved"] = len(self.__search(limit=2)) == 1
+
+        if grade["solved"]:
+            if grade["search"]:
+                grade["level"] = TECHNIQUE_LEVELS["search"]
+            else:
+                grade["level"] = TECHNIQUE_LEVELS.get(grade["hardest"], "easy")
+        return grade
+
+    def grade_many(self, boards):
+        """
+        Grades a stream of Sudoku puzzles, reusing the solver buffers.
+
+        Parameters:
+            boards (iterable): Puzzles in the format accepted by
+                            grade_sudoku_board. Consumed lazily.
+
+        Yields:
+            dict: The result of grade_sudoku_board for each puzzle, in input
+                  order.
+        """
+        for board_list in boards:
+            yield self.grade_sudoku_board(board_list)
+
+    def solve_many(self, boards):
+        """
+        Solves a stream of Sudoku puzzles, reusing the solver buffers.
+
+        Parameters:
+            boards (iterable): Puzzles in the format accepted by
+                            solve_sudoku_board. Consumed lazily.
+
+        Yields:
+            list | str: The result of solve_sudoku_board for each puzzle,
+                        in input order.
+        """
+        for board_list in boards:
+            yield self.solve_sudoku_board(board_list)
+
+    @staticmethod
+    def solve_parallel(boards, workers=None, chunksize=64):
+        """
+        Solves Sudoku puzzles across a pool of worker processes.
+
+        Boards are sent to the workers as compact 81-character strings and
+        every worker reuses a single SudokuSolver.
+
+        Parameters:
+            boards (iterable): Puzzles in the format accepted by
+                            solve_sudoku_board. Consumed lazily.
+            workers (int): Number of worker processes, defaults to the CPU count.
+            chunksize (int): Number of puzzles dispatched to a worker at once.
+
+        Yields:
+            list | str: The result of solve_sudoku_board for each puzzle,
+                        in input order.
+        """
+        import multiprocessing
+
+        with multiprocessing.Pool(
+            processes=workers, initializer=_init_solver_worker
+        ) as pool:
+            encoded_boards = (encode_board(board_list) for board_list in boards)
+            for result in pool.imap(_solve_encoded_board, encoded_boards, chunksize):
+                yield UNSOLVABLE_MESSAGE if result is None else decode_board(result)
+
+    @staticmethod
+    def grade_parallel(boards, workers=None, chunksize=64):
+        """
+        Grades Sudoku puzzles across a pool of worker processes.
+
+        Parameters:
+            boards (iterable): Puzzles in the format accepted by
+                            grade_sudoku_board. Consumed lazily.
+            workers (int): Number of worker processes, defaults to the CPU count.
+            chunksize (int): Number of puzzles dispatched to a worker at once.
+
+        Yields:
+            dict: The result of grade_sudoku_board for each puzzle, in input
+                  order.
+        """
+        import multiprocessing
+
+        with multiprocessing.Pool(
+            processes=workers, initializer=_init_solver_worker
+        ) as pool:
+            encoded_boards = (encode_board(board_list) for board_list in boards)
+            yield from pool.imap(_grade_encoded_board, encoded_boards, chunksize)
+
+    @staticmethod
+    def count_parallel(boards, limit=2, workers=None, chunksize=64):
+        """
+        Counts the solutions of Sudoku puzzles across a pool of worker processes.
+
+        Parameters:
+            boards (iterable): Puzzles in the format accepted by count_solutions.
+                            Consumed lazily.
+            limit (int): Passed to count_solutions, see its documentation.
+            workers (int): Number of worker processes, defaults to the CPU count.
+            chunksize (int): Number of puzzles dispatched to a worker at once.
+
+        Yields:
+            int: The solution count of each puzzle, in input order.
+        """
+        import multiprocessing
+
+        with multiprocessing.Pool(
+            processes=workers, initializer=_init_solver_worker
+        ) as pool:
+            encoded_boards = (encode_board(board_list) for board_list in boards)
+            yield from pool.imap(
+                functools.partial(_count_encoded_board, limit),
+                encoded_boards,
+                chunksize,
+            )
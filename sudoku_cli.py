@@ -0,0 +1,429 @@
+"""
+Command-line interface for bulk Sudoku solving and generation.
+
+Usage:
+    python -m sudoku_cli solve [FILE ...] [-o OUTPUT] [--jobs N]
+    python -m sudoku_cli generate --count N --gaps G [--unique] [--seed S]
+                                  [--hardest TECHNIQUE]
+    python -m sudoku_cli count [FILE ...] [--limit L] [--jobs N]
+    python -m sudoku_cli grade [FILE ...] [-o OUTPUT] [--jobs N]
+    python -m sudoku_cli dedupe [FILE ...] [-o OUTPUT] [--jobs N]
+    python -m sudoku_cli bench [--count N] [--gaps G] [--seed S] [--jobs N]
+
+Puzzles are read from the given files, or from stdin when no file (or '-')
+is given, in the one-puzzle-per-line text format. A throughput summary is
+printed to stderr when a command finishes.
+"""
+
+import argparse
+import collections
+import contextlib
+import itertools
+import os
+import sys
+import time
+
+from sudoku_class import (
+    GENERATION_METHODS,
+    GRADES,
+    UNSOLVABLE_MESSAGE,
+    Sudoku,
+    SudokuSolver,
+)
+from sudoku_canonical import canonical_hash, hash_parallel
+from sudoku_io import PackedBoardWriter, read_text_boards, write_text_boards
+
+
+def _read_lines(paths):
+    """Yield the lines of text files, or of stdin if no path is given."""
+    for path in paths or ["-"]:
+        if path == "-":
+            yield from sys.stdin
+        else:
+            # Undecodable bytes become invalid lines instead of ending the run.
+            with open(path, encoding="ascii", errors="replace") as board_file:
+                yield from board_file
+
+
+def _read_boards(paths, invalid):
+    """
+    Yield boards from text files, or from stdin if no path is given.
+
+    Lines that aren't valid puzzles are appended to `invalid` as
+    (position, message) rather than ending the run; see read_text_boards.
+    """
+    return read_text_boards(_read_lines(paths), invalid)
+
+
+def _with_invalid_lines(results, invalid):
+    """
+    Yield results with each invalid line's message in its input position,
+    so output lines stay aligned with the input.
+    """
+    position = 0
+    for result in results:
+        while invalid and invalid[0][0] <= position:
+            yield invalid.popleft()[1]
+        yield result
+        position += 1
+    while invalid:
+        yield invalid.popleft()[1]
+
+
+@contextlib.contextmanager
+def _open_output(path):
+    """Open the output file for writing, or use stdout for None or '-'."""
+    if path is None or path == "-":
+        yield sys.stdout
+    else:
+        with open(path, "w", encoding="ascii") as output_file:
+            yield output_file
+
+
+def _print_summary(command, count, elapsed, details=""):
+    """Print a throughput summary line to stderr."""
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    details = f" ({details})" if details else ""
+    print(
+        f"{command}: {count} puzzles{details} in {elapsed:.3f} s, {rate:.1f} puzzles/s",
+        file=sys.stderr,
+    )
+
+
+def _solve_boards(boards, jobs, chunksize):
+    """Solve boards in this process or across a pool, depending on jobs."""
+    if jobs == 1:
+        return SudokuSolver().solve_many(boards)
+    return SudokuSolver.solve_parallel(boards, workers=jobs, chunksize=chunksize)
+
+
+def _generate_boards(args):
+    """Generate (gaps, solution) pairs in this process or across a pool."""
+    options = {
+        "seed": args.seed,
+        "unique": args.unique,
+        "symmetric": args.symmetric,
+        "method": args.method,
+        "hardest": args.hardest,
+    }
+    if args.jobs == 1:
+        return Sudoku.generate_many(args.count, args.gaps, **options)
+    return Sudoku.generate_parallel(
+        args.count, args.gaps, workers=args.jobs, chunksize=args.chunksize, **options
+    )
+
+
+def _command_solve(args):
+    """Solve puzzles and write one solution line per puzzle."""
+    counts = {"solved": 0, "unsolved": 0}
+    invalid = collections.deque()
+
+    def tally(results):
+        for result in results:
+            counts["unsolved" if isinstance(result, str) else "solved"] += 1
+            yield result
+
+    start = time.perf_counter()
+    with _open_output(args.output) as output:
+        boards = _read_boards(args.files, invalid)
+        results = tally(_solve_boards(boards, args.jobs, args.chunksize))
+        total = write_text_boards(output, _with_invalid_lines(results, invalid))
+    _print_summary(
+        "solve",
+        total,
+        time.perf_counter() - start,
+        f"{counts['solved']} solved, {counts['unsolved']} unsolved,"
+        f" {total - counts['solved'] - counts['unsolved']} invalid",
+    )
+
+
+def _command_generate(args):
+    """Generate puzzles and write them as text lines or a packed corpus."""
+    start = time.perf_counter()
+    puzzles = _generate_boards(args)
+    if args.packed:
+        if args.output is None or args.output == "-":
+            raise SystemExit("generate: --packed requires --output FILE.")
+        with PackedBoardWriter(args.output) as writer:
+            for board_gaps, board_solution in puzzles:
+                writer.write(board_gaps)
+                if args.solutions:
+                    writer.write(board_solution)
+    else:
+        lines = (
+            itertools.chain.from_iterable(puzzles)
+            if args.solutions
+            else (board_gaps for board_gaps, _ in puzzles)
+        )
+        with _open_output(args.output) as output:
+            write_text_boards(output, lines)
+    _print_summary("generate", args.count, time.perf_counter() - start)
+
+
+def _command_count(args):
+    """Count solutions up to a limit and write one count per puzzle."""
+    invalid = collections.deque()
+    boards = _read_boards(args.files, invalid)
+    if args.jobs == 1:
+        solver = SudokuSolver()
+        counts = (solver.count_solutions(board, args.limit) for board in boards)
+    else:
+        counts = SudokuSolver.count_parallel(
+            boards, args.limit, workers=args.jobs, chunksize=args.chunksize
+        )
+
+    start = time.perf_counter()
+    total = unique = errors = 0
+    with _open_output(args.output) as output:
+        for count in _with_invalid_lines(counts, invalid):
+            output.write(f"{count}\n")
+            total += 1
+            if isinstance(count, str):
+                errors += 1
+            else:
+                unique += count == 1
+    _print_summary(
+        "count",
+        total,
+        time.perf_counter() - start,
+        f"{unique} with a single solution, {errors} invalid",
+    )
+
+
+def _command_grade(args):
+    """Grade puzzles and write one tab-separated grade line per puzzle."""
+    invalid = collections.deque()
+    boards = _read_boards(args.files, invalid)
+    if args.jobs == 1:
+        grades = SudokuSolver().grade_many(boards)
+    else:
+        grades = SudokuSolver.grade_parallel(
+            boards, workers=args.jobs, chunksize=args.chunksize
+        )
+
+    start = time.perf_counter()
+    levels = collections.Counter()
+    with _open_output(args.output) as output:
+        for grade in _with_invalid_lines(grades, invalid):
+            if isinstance(grade, str):
+                levels["invalid"] += 1
+                output.write(f"{grade}\n")
+                continue
+            levels[grade["level"]] += 1
+            if grade["solved"]:
+                output.write(
+                    f"{grade['level']}\t{grade['hardest'] or '-'}\t{grade['steps']}"
+                    f"\t{'search' if grade['search'] else 'logic'}\n"
+                )
+            else:
+                output.write(f"{UNSOLVABLE_MESSAGE}\n")
+    _print_summary(
+        "grade",
+        sum(levels.values()),
+        time.perf_counter() - start,
+        ", ".join(f"{count} {level or 'unsolved'}" for level, count in levels.items()),
+    )
+
+
+def _command_dedupe(args):
+    """Write each puzzle that is not a symmetry of an earlier one."""
+    # Dedupe output doesn't follow the input lines, so bad lines are skipped.
+    invalid = []
+    boards = _read_boards(args.files, invalid)
+    if args.jobs == 1:
+        keyed = ((board_list, canonical_hash(board_list)) for board_list in boards)
+    else:
+        keyed = hash_parallel(
+            boards, workers=args.jobs, chunksize=args.chunksize, keyed=True
+        )
+
+    start = time.perf_counter()
+    seen = set()
+    total = 0
+
+    def unseen():
+        nonlocal total
+        for board_list, key in keyed:
+            total += 1
+            if key not in seen:
+                seen.add(key)
+                yield board_list
+
+    with _open_output(args.output) as output:
+        kept = write_text_boards(output, unseen())
+    _print_summary(
+        "dedupe",
+        total,
+        time.perf_counter() - start,
+        f"{kept} kept, {total - kept} duplicates, {len(invalid)} invalid skipped",
+    )
+
+
+def _command_bench(args):
+    """Generate a seeded batch of puzzles and measure solving throughput."""
+    # Puzzles with several solutions would only time the search that proves
+    # it, so the batch is always carved to a single solution.
+    args.unique = True
+    start = time.perf_counter()
+    boards = [board_gaps for board_gaps, _ in _generate_boards(args)]
+    _print_summary(
+        "generate",
+        len(boards),
+        time.perf_counter() - start,
+        f"{args.gaps} gaps, unique",
+    )
+
+    start = time.perf_counter()
+    solved = sum(
+        not isinstance(result, str)
+        for result in _solve_boards(boards, args.jobs, args.chunksize)
+    )
+    _print_summary(
+        "solve", len(boards), time.perf_counter() - start, f"{solved} solved"
+    )
+
+
+def _build_parser():
+    """Build the argument parser with its subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="python -m sudoku_cli",
+        description="Bulk Sudoku solving and generation.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pool_options = argparse.ArgumentParser(add_help=False)
+    pool_options.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes to use (default: 1, 0 for one per CPU)",
+    )
+    pool_options.add_argument(
+        "--chunksize",
+        type=int,
+        default=64,
+        help="puzzles dispatched to a worker at once (default: 64)",
+    )
+
+    input_options = argparse.ArgumentParser(add_help=False)
+    input_options.add_argument(
+        "files", nargs="*", help="puzzle files, one puzzle per line (default: stdin)"
+    )
+    input_options.add_argument(
+        "-o", "--output", help="output file (default: stdout)"
+    )
+
+    generate_options = argparse.ArgumentParser(add_help=False)
+    generate_options.add_argument(
+        "--gaps", type=int, default=50, help="empty cells per puzzle (default: 50)"
+    )
+    generate_options.add_argument("--seed", help="master seed for a reproducible batch")
+    generate_options.add_argument(
+        "--unique",
+        action="store_true",
+        help="only generate puzzles with a single solution",
+    )
+    generate_options.add_argument(
+        "--symmetric",
+        action="store_true",
+        help="with --unique, carve gaps in symmetric pairs",
+    )
+    generate_options.add_argument(
+        "--method",
+        choices=GENERATION_METHODS,
+        default="backtrack",
+        help="how complete grids are built (default: backtrack)",
+    )
+    generate_options.add_argument(
+        "--hardest",
+        choices=GRADES,
+        help="only generate puzzles whose hardest needed technique is this one",
+    )
+
+    solve_parser = subparsers.add_parser(
+        "solve",
+        parents=[input_options, pool_options],
+        help="solve puzzles, writing one solution per line",
+    )
+    solve_parser.set_defaults(handler=_command_solve)
+
+    generate_parser = subparsers.add_parser(
+        "generate",
+        parents=[generate_options, pool_options],
+        help="generate puzzles",
+    )
+    generate_parser.add_argument(
+        "-n", "--count", type=int, default=1, help="puzzles to generate (default: 1)"
+    )
+    generate_parser.add_argument(
+        "-o", "--output", help="output file (default: stdout)"
+    )
+    generate_parser.add_argument(
+        "--solutions",
+        action="store_true",
+        help="write each solution after its puzzle",
+    )
+    generate_parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="write a packed binary corpus instead of text",
+    )
+    generate_parser.set_defaults(handler=_command_generate)
+
+    count_parser = subparsers.add_parser(
+        "count",
+        parents=[input_options, pool_options],
+        help="count solutions of puzzles, writing one count per line",
+    )
+    count_parser.add_argument(
+        "--limit",
+        type=int,
+        default=2,
+        help="stop counting at this many solutions (default: 2)",
+    )
+    count_parser.set_defaults(handler=_command_count)
+
+    grade_parser = subparsers.add_parser(
+        "grade",
+        parents=[input_options, pool_options],
+        help="grade puzzles by the hardest technique they need",
+    )
+    grade_parser.set_defaults(handler=_command_grade)
+
+    dedupe_parser = subparsers.add_parser(
+        "dedupe",
+        parents=[input_options, pool_options],
+        help="drop puzzles that are symmetries or relabellings of earlier ones",
+    )
+    dedupe_parser.set_defaults(handler=_command_dedupe)
+
+    bench_parser = subparsers.add_parser(
+        "bench",
+        parents=[generate_options, pool_options],
+        help="measure generation and solving throughput on unique puzzles",
+    )
+    bench_parser.add_argument(
+        "-n", "--count", type=int, default=1000, help="puzzles to use (default: 1000)"
+    )
+    bench_parser.set_defaults(handler=_command_bench, seed="0")
+
+    return parser
+
+
+def main(argv=None):
+    """Run the command-line interface."""
+    args = _build_parser().parse_args(argv)
+    if args.jobs == 0:
+        args.jobs = None
+    try:
+        args.handler(args)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); silence the flush at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
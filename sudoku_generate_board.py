@@ -1,9 +1,10 @@
 import os
 import random
 import time
-from matplotlib import pyplot as plt
+from sudoku_class import PEERS, generate_grid
 
 data = {}
+stats = {"backtracks": 0, "restarts": 0}
 
 def initialize_board():
     """Initializes an empty Sudoku board with metadata."""
@@ -18,13 +19,10 @@ def initialize_board():
             "state": "ready",
         }
 
-def remove_other(row: int, col: int, box: int, number: int):
+def remove_other(index: int, number: int):
     """Removes the possibility of a given number in the row, column, and box."""
-    for i in range(81):
-        if (
-            number in data[i]["pos"] and 
-            (data[i]["row"] == row or data[i]["col"] == col or data[i]["box"] == box)
-        ):
+    for i in (index,) + PEERS[index]:
+        if number in data[i]["pos"]:
             data[i]["pos"].remove(number)
 
 def fill_cell(index: int):
@@ -33,28 +31,23 @@ def fill_cell(index: int):
         number = data[index]["pos"].pop()
         data[index]["value"] = number
         data[index]["state"] = "checked"
-        remove_other(data[index]["row"], data[index]["col"], data[index]["box"], number)
+        remove_other(index, number)
 
 def sudoku():
-    """Generates a Sudoku board by randomly filling values."""
+    """
+    Generates a Sudoku board by randomized MRV backtracking.
+
+    Dead ends only undo the latest placements, so every call succeeds without
+    restarting on exceptions. The work it took is stored in `stats`.
+    """
+    grid, grid_stats = generate_grid(random)
+    stats.update(grid_stats)
     initialize_board()
-    for _ in range(10000):  # Attempts up to 100 times to avoid deadlocks
-        try:
-            for index in range(81):
-                if data[index]["state"] == "ready":
-                    number = random.choice(data[index]["pos"])
-                    data[index]["value"] = number
-                    data[index]["state"] = "checked"
-                    remove_other(data[index]["row"], data[index]["col"], data[index]["box"], number)
-
-            for index in range(81):
-                fill_cell(index)
-            return data # Exit the function if successful
-
-        except Exception:
-            initialize_board()  # Restart the board on error
-    else:
-        raise ValueError("Sudoku generation failed: Maximum attempts reached.")
+    for index, number in enumerate(grid):
+        data[index]["value"] = number
+        data[index]["state"] = "checked"
+        data[index]["pos"] = []
+    return data
 
 
 def draw(attribute: str):
@@ -107,6 +100,8 @@ def run_multiple_tests(test_runs=1000):
     worked = 0
     wrong = 0
     times = []
+    backtracks = 0
+    restarts = 0
 
     for _ in range(test_runs):
         try:
@@ -114,11 +109,14 @@ def run_multiple_tests(test_runs=1000):
             sudoku()
             worked += 1
             times.append(time.process_time() - start)
+            backtracks += stats["backtracks"]
+            restarts += stats["restarts"]
         except Exception:
             wrong += 1
 
     avg_time = sum(times) / len(times) if times else 0
-    print(f"\nTests run: {test_runs}\nSuccessful: {worked}\nFailed: {wrong}\nMax time: {max(times):.4f} seconds\nAverage time: {avg_time:.4f} seconds\n")
+    print(f"\nTests run: {test_runs}\nSuccessful: {worked}\nFailed: {wrong}\nMax time: {max(times):.4f} seconds\nAverage time: {avg_time:.4f} seconds")
+    print(f"Backtracks: {backtracks}\nRestarts: {restarts}\n")
 
 def measure_performance(times):
     """Measures the performance of the Sudoku generator for different iterations."""
@@ -136,6 +134,8 @@ def measure_performance(times):
 
 def plot_results(times, results):
     """Plots the performance results."""
+    from matplotlib import pyplot as plt
+
     f, axs = plt.subplots(1, 2, figsize=(10, 5))
 
     axs[0].plot(times, results, color='green', marker='o', markersize=5, linestyle='dashed', linewidth=2)
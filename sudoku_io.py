@@ -0,0 +1,207 @@
+import itertools
+import mmap
+
+# Packed corpus format: a 4-byte magic header followed by fixed-width records.
+# Each record stores the 81 cells as 4-bit digits (0 for empty cells), two per
+# byte with the first cell in the high nibble, padded to 41 bytes.
+PACKED_MAGIC = b"SDK1"
+PACKED_RECORD_SIZE = 41
+
+BYTE_NIBBLES = tuple((byte >> 4, byte & 0x0F) for byte in range(256))
+
+# Text format: one puzzle per line as 81 characters, '.', '0' or 'X' for blanks.
+# Translating a line's bytes straight to the values 0-9 produces the board
+# without per-character int() calls. Every other byte maps to 0xFF, so one
+# max() check rejects any stray character, control characters included.
+TEXT_TO_DIGIT = bytes(
+    byte - ord("0") if ord("0") <= byte <= ord("9") else 0 if byte in b".Xx" else 0xFF
+    for byte in range(256)
+)
+
+
+def pack_board(board_list):
+    """
+    Pack a 1D board into a 41-byte record.
+
+    Parameters:
+        board_list (list): A list of 81 values. Use 'X', None or 0 for empty cells.
+
+    Returns:
+        bytes: The packed record.
+    """
+    if len(board_list) != 81:
+        raise ValueError("Input list must contain exactly 81 elements.")
+    digits = [0 if value == "X" or value is None else value for value in board_list]
+    if not all(isinstance(value, int) and 0 <= value <= 9 for value in digits):
+        raise ValueError("Board values must be digits between 0 and 9.")
+    digits.append(0)
+    return bytes((digits[i] << 4) | digits[i + 1] for i in range(0, 82, 2))
+
+
+def unpack_board(record):
+    """Unpack a 41-byte record into a 1D list of integers with 0 for empty cells."""
+    board = list(itertools.chain.from_iterable(map(BYTE_NIBBLES.__getitem__, record)))
+    del board[81:]
+    return board
+
+
+def parse_board_line(line):
+    """
+    Parse one line of the 81-character text format.
+
+    Parameters:
+        line (str): The puzzle, optionally followed by a newline.
+
+    Returns:
+        list: The board as 81 integers with 0 for empty cells.
+    """
+    digits = line.strip().encode("latin-1", "replace").translate(TEXT_TO_DIGIT)
+    if len(digits) != 81 or max(digits) > 9:
+        raise ValueError(f"Invalid Sudoku line: {line.strip()!r}")
+    return list(digits)
+
+
+def format_board_line(board_list, blank="."):
+    """Format a 1D board as an 81-character line using `blank` for empty cells."""
+    return "".join(
+        blank if value == "X" or not value else str(value) for value in board_list
+    )
+
+
+def read_text_boards(stream, invalid=None):
+    """
+    Yield boards from a text stream, one puzzle per line.
+
+    Blank lines and lines starting with '#' are skipped, so the stream is
+    read with constant memory regardless of its size.
+
+    Parameters:
+        stream (file): A text file object such as sys.stdin.
+        invalid (list): If given, lines that can't be parsed are appended to
+                        it as (position, message) instead of raising
+                        ValueError, where position is the number of boards
+                        yielded before the line.
+
+    Yields:
+        list: Each board as 81 integers with 0 for empty cells.
+    """
+    position = 0
+    for line in stream:
+        if line.strip() and not line.startswith("#"):
+            try:
+                board_list = parse_board_line(line)
+            except ValueError as error:
+                if invalid is None:
+                    raise
+                invalid.append((position, str(error)))
+                continue
+            position += 1
+            yield board_list
+
+
+def write_text_boards(stream, boards, blank="."):
+    """
+    Write boards to a text stream, one puzzle per line.
+
+    Solver messages such as "This sudoku doesn't have single solution." are
+    written as they are, so output lines stay aligned with the input.
+
+    Parameters:
+        stream (file): A text file object such as sys.stdout.
+        boards (iterable): 1D boards or solver messages. Consumed lazily.
+        blank (str): Character used for empty cells.
+
+    Returns:
+        int: The number of boards written.
+    """
+    count = 0
+    for board_list in boards:
+        if isinstance(board_list, str):
+            stream.write(board_list)
+        else:
+            stream.write(format_board_line(board_list, blank))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+class PackedBoardWriter:
+    """Writer for corpus files in the packed board format."""
+
+    def __init__(self, path):
+        """
+        Initialize the PackedBoardWriter class.
+
+        Parameters:
+            path (str): File to create. An existing file is overwritten.
+        """
+        self.__file = open(path, "wb")
+        self.__file.write(PACKED_MAGIC)
+        self.count = 0
+
+    def write(self, board_list):
+        """Append one board to the corpus."""
+        self.__file.write(pack_board(board_list))
+        self.count += 1
+
+    def write_many(self, boards):
+        """Append every board of an iterable to the corpus."""
+        for board_list in boards:
+            self.write(board_list)
+
+    def close(self):
+        """Flush and close the corpus file."""
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PackedBoardReader:
+    """Memory-mapped reader for corpus files in the packed board format."""
+
+    def __init__(self, path):
+        """
+        Initialize the PackedBoardReader class.
+
+        Parameters:
+            path (str): Corpus file written by PackedBoardWriter.
+        """
+        with open(path, "rb") as corpus_file:
+            if corpus_file.read(len(PACKED_MAGIC)) != PACKED_MAGIC:
+                raise ValueError("Not a packed Sudoku corpus file.")
+            size = corpus_file.seek(0, 2)
+            if (size - len(PACKED_MAGIC)) % PACKED_RECORD_SIZE:
+                raise ValueError("Packed Sudoku corpus file is truncated.")
+            self.__count = (size - len(PACKED_MAGIC)) // PACKED_RECORD_SIZE
+            self.__map = mmap.mmap(corpus_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.__count
+
+    def __getitem__(self, index):
+        """Return the board at a position in the corpus."""
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError("Board index out of range.")
+        start = len(PACKED_MAGIC) + index * PACKED_RECORD_SIZE
+        return unpack_board(self.__map[start : start + PACKED_RECORD_SIZE])
+
+    def __iter__(self):
+        """Yield the boards of the corpus lazily, in file order."""
+        for index in range(self.__count):
+            yield self[index]
+
+    def close(self):
+        """Release the memory map."""
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
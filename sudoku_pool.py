@@ -0,0 +1,206 @@
+import collections
+import random
+import threading
+
+from sudoku_class import Sudoku, _generate_encoded_puzzle, decode_board
+
+
+class PuzzlePool:
+    """
+    Pool of ready-made Sudoku puzzles, bucketed by gap count.
+
+    Puzzles are taken from the front of a per-bucket deque in O(1). When a
+    bucket drops below its low-water mark a background thread refills it, so
+    serving a new game never waits on generation unless a bucket runs dry.
+    """
+
+    def __init__(
+        self,
+        gaps=(40, 45, 50, 55),
+        size=64,
+        low_water=None,
+        seed=None,
+        processes=0,
+        **options,
+    ):
+        """
+        Initialize the PuzzlePool class. Call start() to begin filling it.
+
+        Parameters:
+            gaps (iterable): Gap counts to keep a bucket of puzzles for.
+                        Pass hardest= in `options` for a pool of one grade.
+            size (int): Number of puzzles a bucket is refilled up to.
+            low_water (int): Refill a bucket once it holds fewer puzzles than
+                        this. Defaults to a quarter of `size`.
+            seed: Master seed. Each bucket derives one seed per puzzle from
+                        it, so a seeded pool always generates the same puzzles.
+            processes (int): Worker processes used for refilling. 0 generates
+                        in the refill thread itself, which holds the GIL and
+                        slows down the threads taking puzzles while it runs;
+                        None uses one per CPU.
+            **options: Passed to Sudoku, e.g. unique=True or method="transform".
+        """
+        for gap_count in gaps:
+            if not isinstance(gap_count, int) or not 0 <= gap_count <= 81:
+                raise ValueError(f"Invalid gap count {gap_count!r}. Use 0 to 81.")
+        self.__size = size
+        self.__low_water = size // 4 if low_water is None else low_water
+        self.__seed = random.getrandbits(64) if seed is None else seed
+        self.__processes = processes
+        self.__options = options
+        self.__buckets = {gap_count: collections.deque() for gap_count in gaps}
+        self.__generated = dict.fromkeys(self.__buckets, 0)
+        self.__stats = {"hits": 0, "misses": 0, "generated": 0}
+        self.__errors = dict.fromkeys(self.__buckets, 0)
+        self.__lock = threading.Lock()
+        self.__refill_needed = threading.Event()
+        self.__closed = threading.Event()
+        self.__thread = None
+
+    def __next_seeds(self, gap_count, count):
+        """Reserve the seeds of the next `count` puzzles of a bucket."""
+        with self.__lock:
+            first = self.__generated[gap_count]
+            self.__generated[gap_count] += count
+        return [f"{self.__seed}:{gap_count}:{first + n}" for n in range(count)]
+
+    def __generate(self, gap_count, puzzle_seed):
+        """Generate one puzzle in this thread, as (board_gaps, board_solution)."""
+        sudoku = Sudoku(gap_count, seed=puzzle_seed, **self.__options)
+        return sudoku.get_board_gaps(), sudoku.get_board_solution()
+
+    def __refill_bucket(self, gap_count, pool):
+        """Top a bucket up to `size` puzzles, a few at a time."""
+        bucket = self.__buckets[gap_count]
+        while len(bucket) < self.__size and not self.__closed.is_set():
+            seeds = self.__next_seeds(gap_count, min(8, self.__size - len(bucket)))
+            if pool is None:
+                puzzles = [self.__generate(gap_count, seed) for seed in seeds]
+            else:
+                options = [
+                    (
+                        gap_count,
+                        self.__options.get("unique", False),
+                        self.__options.get("symmetric", False),
+                        seed,
+                        self.__options.get("method", "backtrack"),
+                        self.__options.get("hardest"),
+                    )
+                    for seed in seeds
+                ]
+                puzzles = [
+                    (
+                        [value or "X" for value in decode_board(gaps_string)],
+                        decode_board(solution_string),
+                    )
+                    for gaps_string, solution_string in pool.map(
+                        _generate_encoded_puzzle, options
+                    )
+                ]
+            bucket.extend(puzzles)
+            with self.__lock:
+                self.__stats["generated"] += len(puzzles)
+
+    def __refill_loop(self):
+        """Background thread: refill every low bucket whenever asked to."""
+        pool = None
+        if self.__processes != 0:
+            import multiprocessing
+
+            pool = multiprocessing.Pool(processes=self.__processes)
+        try:
+            while not self.__closed.is_set():
+                self.__refill_needed.wait()
+                self.__refill_needed.clear()
+                for gap_count, bucket in self.__buckets.items():
+                    if len(bucket) < self.__size:
+                        try:
+                            self.__refill_bucket(gap_count, pool)
+                        except Exception:
+                            # e.g. unique carving that failed after maximum
+                            # attempts. The next pop_boards asks again.
+                            with self.__lock:
+                                self.__errors[gap_count] += 1
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def start(self):
+        """Start the background refill thread and fill every bucket."""
+        if self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__refill_loop, name="sudoku-pool-refill", daemon=True
+            )
+            self.__thread.start()
+        self.__refill_needed.set()
+        return self
+
+    def fill(self):
+        """Fill every bucket up to `size` in the calling thread."""
+        for gap_count in self.__buckets:
+            self.__refill_bucket(gap_count, None)
+
+    def pop_boards(self, gaps):
+        """
+        Take a puzzle out of the pool.
+
+        If the bucket is empty the puzzle is generated on the spot, which is
+        counted as a miss.
+
+        Parameters:
+            gaps (int): Gap count of one of the pool's buckets.
+
+        Returns:
+            tuple: (board_gaps, board_solution) 1D lists, in the same format
+                    as get_board_gaps and get_board_solution.
+        """
+        if gaps not in self.__buckets:
+            raise ValueError(f"The pool has no bucket for {gaps} gaps.")
+        bucket = self.__buckets[gaps]
+        try:
+            puzzle = bucket.popleft()
+            hit = True
+        except IndexError:
+            puzzle = self.__generate(gaps, self.__next_seeds(gaps, 1)[0])
+            hit = False
+        with self.__lock:
+            self.__stats["hits" if hit else "misses"] += 1
+        if len(bucket) < self.__low_water:
+            self.__refill_needed.set()
+        return puzzle
+
+    def get(self, gaps):
+        """Take a puzzle out of the pool as a Sudoku instance. See pop_boards."""
+        return Sudoku.from_boards(*self.pop_boards(gaps))
+
+    def get_stats(self):
+        """
+        Return the pool counters.
+
+        Returns:
+            dict: "hits" and "misses" of pop_boards, puzzles "generated" to
+                    refill the buckets, failed refills per bucket in
+                    "errors" and the current number of puzzles per bucket
+                    in "sizes".
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["errors"] = dict(self.__errors)
+        stats["sizes"] = {
+            gap_count: len(bucket) for gap_count, bucket in self.__buckets.items()
+        }
+        return stats
+
+    def close(self):
+        """Stop the refill thread. Puzzles already in the pool stay available."""
+        self.__closed.set()
+        self.__refill_needed.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
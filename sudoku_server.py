@@ -0,0 +1,405 @@
+"""
+Asyncio Sudoku service with request micro-batching.
+
+Usage:
+    python -m sudoku_server [--host H] [--port P] [--workers N]
+                            [--batch-size B] [--batch-delay S] [--queue-size Q]
+
+The protocol is one JSON object per line over plain TCP, answered in order
+with one JSON object per line:
+
+    {"op": "solve", "board": "4.....8.5.3.........."}
+    {"op": "grade", "board": "..."}
+    {"op": "generate", "gaps": 50, "unique": true, "hardest": "naked_pairs"}
+    {"op": "stats"}
+
+An optional "id" is echoed back. Failures are answered with {"error": ...}.
+Concurrent requests are grouped into small batches for a pool of worker
+processes; generate requests, which can take seconds, are sent one at a time.
+Unique generate requests are limited to MAX_UNIQUE_GAPS gaps and
+GENERATE_ATTEMPTS grids. When the request queue is full the server stops reading from
+connections, so clients are slowed down by TCP flow control.
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import sys
+
+from sudoku_class import Sudoku, SudokuSolver
+from sudoku_io import format_board_line, parse_board_line
+
+OPERATIONS = ("solve", "grade", "generate")
+
+# Unique carving slows down sharply past this many gaps, and symmetric carving
+# rarely gets further at all, so generate requests are capped here.
+MAX_UNIQUE_GAPS = 57
+# Grids a unique generate request may try before it is answered with an error.
+GENERATE_ATTEMPTS = 100
+
+_worker_solver = None
+
+
+def _payload_board(payload):
+    """Parse the "board" of a request, which must be an 81-character string."""
+    board = payload["board"]
+    if not isinstance(board, str):
+        raise TypeError('"board" must be an 81-character string.')
+    return parse_board_line(board)
+
+
+def _check_generate(payload):
+    """Reject generate requests whose gaps are out of range before they queue."""
+    gaps = payload.get("gaps", 50)
+    if isinstance(gaps, bool) or not isinstance(gaps, int) or not 0 <= gaps <= 81:
+        raise ValueError('"gaps" must be an integer from 0 to 81.')
+    unique = payload.get("unique") or payload.get("hardest") is not None
+    if unique and gaps > MAX_UNIQUE_GAPS:
+        raise ValueError(
+            f'"gaps" must be at most {MAX_UNIQUE_GAPS} for unique puzzles.'
+        )
+
+
+def _run_batch(operation, payloads):
+    """
+    Run one batch of requests of the same kind in a worker.
+
+    Parameters:
+        operation (str): One of OPERATIONS.
+        payloads (list): The request dicts of the batch.
+
+    Returns:
+        list: One response dict per request, in order.
+    """
+    global _worker_solver
+    if _worker_solver is None:
+        _worker_solver = SudokuSolver()
+
+    responses = []
+    for payload in payloads:
+        try:
+            if operation == "solve":
+                result = _worker_solver.solve_sudoku_board(_payload_board(payload))
+                if isinstance(result, str):
+                    responses.append({"error": result})
+                else:
+                    responses.append({"solution": format_board_line(result)})
+            elif operation == "grade":
+                responses.append(
+                    _worker_solver.grade_sudoku_board(_payload_board(payload))
+                )
+            else:
+                sudoku = Sudoku(
+                    payload.get("gaps", 50),
+                    unique=bool(payload.get("unique", False)),
+                    symmetric=bool(payload.get("symmetric", False)),
+                    seed=payload.get("seed"),
+                    method=payload.get("method", "backtrack"),
+                    hardest=payload.get("hardest"),
+                    attempts=GENERATE_ATTEMPTS,
+                )
+                responses.append(
+                    {
+                        "puzzle": format_board_line(sudoku.get_board_gaps()),
+                        "solution": format_board_line(sudoku.get_board_solution()),
+                    }
+                )
+        except Exception as error:
+            # Keep each failure with its own request instead of the whole batch.
+            responses.append({"error": str(error) or type(error).__name__})
+    return responses
+
+
+class SudokuServer:
+    """Asyncio TCP server that micro-batches Sudoku requests to worker processes."""
+
+    def __init__(
+        self, workers=None, batch_size=32, batch_delay=0.002, queue_size=1024
+    ):
+        """
+        Initialize the SudokuServer class.
+
+        Parameters:
+            workers (int): Number of worker processes, defaults to the CPU
+                        count. 0 runs batches in a single background thread,
+                        which is convenient for tests.
+            batch_size (int): Most requests sent to a worker at once.
+            batch_delay (float): Seconds to wait for more requests before
+                        sending a batch that isn't full.
+            queue_size (int): Requests allowed to wait for a worker. When
+                        the queue is full, the server stops reading requests
+                        until it drains.
+        """
+        self.__workers = workers
+        self.__batch_size = batch_size
+        self.__batch_delay = batch_delay
+        self.__queue_size = queue_size
+        self.__queue = None
+        self.__executor = None
+        self.__in_flight = None
+        self.__tasks = set()
+        self.__connections = {}  # connection handler task -> its stream writer
+        self.__stats = {"requests": 0, "batches": 0, "errors": 0}
+
+    def __start_executor(self):
+        """Create the executor that runs the batches."""
+        if self.__workers == 0:
+            self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            slots = 1
+        else:
+            slots = self.__workers or os.cpu_count() or 1
+            self.__executor = concurrent.futures.ProcessPoolExecutor(max_workers=slots)
+        # Keep every worker busy with one batch queued behind it, but no more,
+        # so requests wait in the bounded queue where they can be batched.
+        self.__in_flight = asyncio.Semaphore(2 * slots)
+
+    async def __next_batch(self):
+        """Wait for a request, then collect more until the batch is full or due."""
+        loop = asyncio.get_running_loop()
+        batch = [await self.__queue.get()]
+        deadline = loop.time() + self.__batch_delay
+        while len(batch) < self.__batch_size:
+            if self.__queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.__queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                batch.append(self.__queue.get_nowait())
+        return batch
+
+    async def __dispatch(self, operation, requests):
+        """Run one batch in the executor and resolve its futures."""
+        loop = asyncio.get_running_loop()
+        try:
+            responses = await loop.run_in_executor(
+                self.__executor,
+                _run_batch,
+                operation,
+                [payload for payload, _ in requests],
+            )
+        except Exception as error:
+            responses = [{"error": f"Worker failed: {error}"}] * len(requests)
+        finally:
+            self.__in_flight.release()
+        for (_, future), response in zip(requests, responses):
+            if not future.done():
+                future.set_result(response)
+
+    async def __batch_loop(self):
+        """Group queued requests by operation and send them to the workers."""
+        while True:
+            batch = await self.__next_batch()
+            by_operation = {}
+            for operation, payload, future in batch:
+                by_operation.setdefault(operation, []).append((payload, future))
+            for operation, requests in by_operation.items():
+                # A generate request can take seconds, so each one is sent on
+                # its own instead of holding up the rest of a batch.
+                if operation == "generate":
+                    groups = [[request] for request in requests]
+                else:
+                    groups = [requests]
+                for group in groups:
+                    await self.__in_flight.acquire()
+                    self.__stats["batches"] += 1
+                    self.__spawn(self.__dispatch(operation, group))
+
+    def __spawn(self, coroutine):
+        """Run a coroutine as a task that is kept alive until it finishes."""
+        task = asyncio.ensure_future(coroutine)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+        return task
+
+    def __answer_now(self, response):
+        """Return an already resolved future for a response."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(response)
+        return future
+
+    async def __submit(self, line):
+        """
+        Parse a request line and queue it for the workers.
+
+        Returns:
+            tuple: The request's "id" (or None) and the future of its response.
+        """
+        try:
+            payload = json.loads(line)
+            if not isinstance(payload, dict):
+                raise ValueError("Request must be a JSON object.")
+        except ValueError as error:
+            self.__stats["errors"] += 1
+            return None, self.__answer_now({"error": f"Invalid request: {error}"})
+
+        request_id = payload.get("id")
+        operation = payload.get("op")
+        if operation == "stats":
+            return request_id, self.__answer_now(self.get_stats())
+        if operation not in OPERATIONS:
+            self.__stats["errors"] += 1
+            operations = ", ".join(OPERATIONS + ("stats",))
+            return request_id, self.__answer_now(
+                {"error": f"Unknown op. Use {operations}."}
+            )
+        if operation == "generate":
+            try:
+                _check_generate(payload)
+            except ValueError as error:
+                self.__stats["errors"] += 1
+                return request_id, self.__answer_now({"error": str(error)})
+
+        self.__stats["requests"] += 1
+        future = asyncio.get_running_loop().create_future()
+        # Blocks while the queue is full, which stops this connection's reads.
+        await self.__queue.put((operation, payload, future))
+        return request_id, future
+
+    async def __write_responses(self, pending, writer):
+        """Write the responses of a connection in request order."""
+        while True:
+            item = await pending.get()
+            if item is None:
+                return
+            request_id, future = item
+            response = dict(await future)
+            if request_id is not None:
+                response["id"] = request_id
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def __handle_connection(self, reader, writer):
+        """Read request lines from a client and queue them for the workers."""
+        self.__connections[asyncio.current_task()] = writer
+        # Bounds the responses a client can have outstanding on one connection.
+        pending = asyncio.Queue(maxsize=self.__batch_size * 4)
+        responder = self.__spawn(self.__write_responses(pending, writer))
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                await pending.put(await self.__submit(line))
+            await pending.put(None)
+            await responder
+        except (ConnectionError, ValueError):
+            # ValueError: the client sent a line longer than the read limit.
+            responder.cancel()
+        finally:
+            del self.__connections[asyncio.current_task()]
+            writer.close()
+
+    def get_stats(self):
+        """
+        Return the server counters.
+
+        Returns:
+            dict: Requests queued, batches sent, malformed requests in
+                  "errors", open "connections", the current "queue" depth
+                  and the mean "batch_size".
+        """
+        stats = dict(self.__stats)
+        stats["connections"] = len(self.__connections)
+        stats["queue"] = self.__queue.qsize() if self.__queue else 0
+        if stats["batches"]:
+            stats["batch_size"] = stats["requests"] / stats["batches"]
+        else:
+            stats["batch_size"] = 0.0
+        return stats
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """
+        Start the executor, the batching task and the TCP listener.
+
+        Parameters:
+            host (str): Address to listen on.
+            port (int): Port to listen on, 0 for any free port.
+
+        Returns:
+            asyncio.Server: The listening server. Its sockets give the port.
+        """
+        self.__queue = asyncio.Queue(maxsize=self.__queue_size)
+        self.__start_executor()
+        self.__spawn(self.__batch_loop())
+        return await asyncio.start_server(self.__handle_connection, host, port)
+
+    async def close(self):
+        """Close open connections, stop the batching task and shut the workers down."""
+        for writer in self.__connections.values():
+            writer.close()
+        await asyncio.gather(*self.__connections, return_exceptions=True)
+        for task in list(self.__tasks):
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True, cancel_futures=True)
+            self.__executor = None
+
+
+async def _serve(args):
+    """Run the server until it is interrupted."""
+    service = SudokuServer(
+        workers=args.workers,
+        batch_size=args.batch_size,
+        batch_delay=args.batch_delay,
+        queue_size=args.queue_size,
+    )
+    server = await service.start(args.host, args.port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving Sudoku requests on {address[0]}:{address[1]}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    """Run the Sudoku service from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m sudoku_server",
+        description="Asyncio Sudoku service with request micro-batching.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument(
+        "--port", type=int, default=8765, help="port to listen on (default: 8765)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes (default: one per CPU, 0 for a single thread)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=32,
+        help="most requests sent to a worker at once (default: 32)",
+    )
+    parser.add_argument(
+        "--batch-delay",
+        type=float,
+        default=0.002,
+        help="seconds to wait to fill a batch (default: 0.002)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=1024,
+        help="requests allowed to wait before reads pause (default: 1024)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,15 +3,18 @@
 # 2 (Medium) - 46 to 49
 # 3 (Difficult) - 50 to 53
 # 4 (Extremely Difficult) - 54 to 58
+#
+# Gap counts are only a rough guide. SudokuSolver.grade_sudoku_board rates a
+# puzzle by the hardest technique it needs instead (see TECHNIQUE_LEVELS).
 
 
 import copy
 import os
 import random
-from matplotlib import pyplot as plt
+from sudoku_class import PEERS
 from sudoku_generate_board import sudoku
 
-sudoku_board_data = sudoku()
+sudoku_board_data = None  # Generated on first use by test_sudoku_solver
 
 def create_gaps(data, n):
     """Creates gaps in the Sudoku board by marking cells as empty."""
@@ -42,8 +45,6 @@ def draw_board(attribute, data):
 
     print(output)
 
-os.system("cls" if os.name == "nt" else "clear")
-
 # data_new = create_gaps(sudoku_board_data, 50)  # Adjust number of gaps as needed
 
 # draw_board("value", sudoku_board_data)  # Original board
@@ -102,12 +103,11 @@ def draw_possibilities(data):
 # draw_possibilities(data_new)  # Board with gaps
 
 
-def remove_other_new(r, c, b, n):
+def remove_other_new(index, n):
     """Removes a value from possibilities in related rows, columns, and boxes."""
-    for i in range(81):
+    for i in (index,) + PEERS[index]:
         if n in data_new[i]["pos"]:
-            if data_new[i]["row"] == r or data_new[i]["col"] == c or data_new[i]["box"] == b:
-                data_new[i]["pos"].remove(n)
+            data_new[i]["pos"].remove(n)
 
 def one_in_box():
     """Finds and processes cells with unique possibilities within boxes."""
@@ -127,7 +127,7 @@ def one_in_box():
                 unique_idx = obj[i]["pos"][0]
                 data_new[unique_idx]["value_new"] = i
                 data_new[unique_idx]["pos"] = []
-                remove_other_new(data_new[unique_idx]["row"], data_new[unique_idx]["col"], data_new[unique_idx]["box"], i)
+                remove_other_new(unique_idx, i)
 
 def one_in_row():
     """Finds and processes cells with unique possibilities within rows."""
@@ -145,7 +145,7 @@ def one_in_row():
                 unique_idx = obj[n]["pos"][0]
                 data_new[unique_idx]["value_new"] = n
                 data_new[unique_idx]["pos"] = []
-                remove_other_new(data_new[unique_idx]["row"], data_new[unique_idx]["col"], data_new[unique_idx]["box"], n)
+                remove_other_new(unique_idx, n)
 
 def one_in_col():
     """Finds and processes cells with unique possibilities within columns."""
@@ -163,7 +163,7 @@ def one_in_col():
                 unique_idx = obj[n]["pos"][0]
                 data_new[unique_idx]["value_new"] = n
                 data_new[unique_idx]["pos"] = []
-                remove_other_new(data_new[unique_idx]["row"], data_new[unique_idx]["col"], data_new[unique_idx]["box"], n)
+                remove_other_new(unique_idx, n)
 
 def naked_pair():
     """Identifies and processes naked pairs in rows, columns, and boxes."""
@@ -279,7 +279,7 @@ def check_new():
         if len(data_new[i]["pos"]) == 1 and data_new[i]["state"] == "empty":
             value = data_new[i]["pos"].pop()
             data_new[i]["value_new"] = value
-            remove_other_new(data_new[i]["row"], data_new[i]["col"], data_new[i]["box"], value)
+            remove_other_new(i, value)
             progress = True
     return not progress
 
@@ -340,7 +340,9 @@ def check_pos():
 
 def test_sudoku_solver(iterations=1000, gaps=53):
     """Tests the Sudoku solver over a specified number of iterations."""
-    global data_new
+    global data_new, sudoku_board_data
+    if sudoku_board_data is None:
+        sudoku_board_data = sudoku()
     correct = 0
     wrong = 0
 
@@ -364,6 +366,8 @@ def test_sudoku_solver(iterations=1000, gaps=53):
 
 def plot_gaps_to_results():
     """Plots the number of gaps vs. correct and wrong results."""
+    from matplotlib import pyplot as plt
+
     gaps_range = range(10, 81)
     correct_results = []
     wrong_results = []
@@ -384,4 +388,6 @@ def plot_gaps_to_results():
     plt.legend()
     plt.show()
 
-plot_gaps_to_results()
+if __name__ == "__main__":
+    os.system("cls" if os.name == "nt" else "clear")
+    plot_gaps_to_results()
@@ -0,0 +1,271 @@
+import itertools
+
+import numpy as np
+
+from sudoku_class import (
+    ALL_DIGITS_MASK,
+    BIT_COUNT,
+    CELL_UNIT_IDS,
+    DIGIT_BIT,
+    TECHNIQUE_LEVELS,
+    UNITS,
+    UNSOLVABLE_MESSAGE,
+    SudokuSolver,
+    encode_board,
+)
+
+# Candidates are 9-bit masks per cell, as in SudokuSolver, so a whole stack of
+# boards is an (N, 81) uint16 array and a unit gather is only 9 values wide.
+UNIT_INDICES = np.array(UNITS)
+CELL_UNIT_INDICES = tuple(np.array(ids) for ids in zip(*CELL_UNIT_IDS))
+DIGIT_MASKS = np.array(DIGIT_BIT, dtype=np.uint16)
+MASK_COUNT = np.array(BIT_COUNT, dtype=np.uint8)
+MASK_DIGIT = np.zeros(ALL_DIGITS_MASK + 1, dtype=np.uint8)
+MASK_DIGIT[DIGIT_MASKS[1:]] = np.arange(1, 10)
+
+# Search nodes a board may use in the stacked search before it is handed to
+# SudokuSolver, so one wide search tree can't blow up the stack.
+MAX_SEARCH_NODES = 32
+
+
+class VectorizedSudokuSolver:
+    """Sudoku class for solving stacks of Sudoku puzzles with NumPy."""
+
+    def __init__(self):
+        """Initialize the VectorizedSudokuSolver and its fallback SudokuSolver."""
+        self.__fallback_solver = SudokuSolver()
+
+    @staticmethod
+    def __boards_to_array(boards):
+        """
+        Converts 1D boards into an (N, 81) array of digits with 0 for empty cells.
+
+        Parameters:
+            boards (list): Puzzles in the format accepted by solve_sudoku_board.
+
+        Returns:
+            numpy.ndarray: The digits of every board as uint8.
+        """
+        encoded = []
+        for board_list in boards:
+            if len(board_list) != 81:
+                raise ValueError("Input list must contain exactly 81 elements.")
+            encoded.append(encode_board(board_list))
+        digits = np.frombuffer("".join(encoded).encode("ascii"), dtype=np.uint8)
+        return (digits - ord("0")).reshape(len(encoded), 81)
+
+    @staticmethod
+    def __cell_units(unit_masks):
+        """OR the (N, 27) masks of each cell's row, column and box into (N, 81)."""
+        rows, cols, boxes = CELL_UNIT_INDICES
+        return unit_masks[:, rows] | unit_masks[:, cols] | unit_masks[:, boxes]
+
+    def __candidates(self, values):
+        """Return the (N, 81) candidate masks of a stack of boards."""
+        used = np.bitwise_or.reduce(DIGIT_MASKS[values][:, UNIT_INDICES], axis=2)
+        free = ~self.__cell_units(used) & ALL_DIGITS_MASK
+        return np.where(values == 0, free, 0).astype(np.uint16)
+
+    def __find_singles(self, candidates, naked):
+        """
+        Return the (N, 81) masks of the digits that singles place.
+
+        A digit is a hidden single where it has one place left in a row,
+        column or box, and a naked single where it is a cell's only candidate.
+        """
+        unit_candidates = candidates[:, UNIT_INDICES]
+        once = np.zeros(unit_candidates.shape[:2], dtype=np.uint16)
+        twice = np.zeros_like(once)
+        for cell in range(9):
+            masks = unit_candidates[:, :, cell]
+            twice |= once & masks
+            once |= masks
+        singles = candidates & self.__cell_units(once & ~twice)
+        if naked:
+            is_single = (candidates & (candidates - 1)) == 0
+            singles |= np.where(is_single, candidates, 0).astype(np.uint16)
+        return singles
+
+    def __propagate(self, values, naked=True):
+        """
+        Applies naked and hidden singles to a stack of boards until they stall.
+
+        Each round only touches the boards that changed in the previous one.
+
+        Parameters:
+            values (numpy.ndarray): An (N, 81) array of digits, updated in place.
+            naked (bool): Also apply naked singles. Without them only hidden
+                        singles run.
+        """
+        active = np.arange(len(values))
+        while len(active):
+            stack = values[active]
+            singles = self.__find_singles(self.__candidates(stack), naked)
+            # A cell can be a single for two digits on a contradictory board;
+            # the lowest one is placed and the board fails the final check.
+            lowest = singles & (~singles + 1)
+            boards, cells = np.nonzero(lowest)
+            stack[boards, cells] = MASK_DIGIT[lowest[boards, cells]]
+            changed = np.unique(boards)
+            values[active[changed]] = stack[changed]
+            active = active[changed]
+
+    @staticmethod
+    def __is_solved(values):
+        """Return a boolean per board telling if it is a complete valid grid."""
+        unit_values = np.sort(values[:, UNIT_INDICES], axis=2)
+        return (unit_values == np.arange(1, 10, dtype=values.dtype)).all(axis=(1, 2))
+
+    def __search(self, values, limit=2):
+        """
+        Searches a stack of boards for up to `limit` solutions each.
+
+        Every round guesses on each open board's cell with the fewest
+        candidates, stacks one new board per candidate and applies singles
+        to the whole stack again. A board whose search grows past
+        MAX_SEARCH_NODES is finished by SudokuSolver's search instead.
+
+        Parameters:
+            values (numpy.ndarray): An (N, 81) array of digits.
+            limit (int): Stop searching a board once this many solutions
+                        have been found.
+
+        Returns:
+            list: The solutions found for each board, as lists of 81 integers.
+        """
+        solutions = [[] for _ in range(len(values))]
+        found = np.zeros(len(values), dtype=np.int64)
+        nodes = np.zeros(len(values), dtype=np.int64)
+        handed_over = np.zeros(len(values), dtype=bool)
+        start_values = values
+        origins = np.arange(len(values))
+        values = values.copy()
+
+        while len(values):
+            self.__propagate(values)
+            candidates = self.__candidates(values)
+            empty = values == 0
+            complete = ~empty.any(axis=1)
+            for row in np.nonzero(complete & self.__is_solved(values))[0]:
+                board = origins[row]
+                if found[board] < limit:
+                    solutions[board].append(values[row].tolist())
+                    found[board] += 1
+
+            dead = (empty & (candidates == 0)).any(axis=1)
+            done = (found >= limit) | handed_over
+            keep = ~complete & ~dead & ~done[origins]
+            values, origins, candidates = values[keep], origins[keep], candidates[keep]
+            if not len(values):
+                break
+
+            counts = MASK_COUNT[candidates]
+            cells = np.where(values == 0, counts, 10).argmin(axis=1)
+            guesses = candidates[np.arange(len(values)), cells]
+            rows, digits = np.nonzero(guesses[:, None] & DIGIT_MASKS[1:])
+            values = values[rows]
+            values[np.arange(len(rows)), cells[rows]] = digits + 1
+            origins = origins[rows]
+
+            nodes += np.bincount(origins, minlength=len(nodes))
+            handed_over |= nodes > MAX_SEARCH_NODES
+            keep = ~handed_over[origins]
+            values, origins = values[keep], origins[keep]
+
+        for board in np.nonzero(handed_over)[0]:
+            solutions[board] = self.__fallback_solver.search_solutions(
+                start_values[board].tolist(), limit
+            )
+        return solutions
+
+    def solve_boards(self, boards):
+        """
+        Solves a list of Sudoku puzzles as a single NumPy stack.
+
+        Naked and hidden singles run across all boards at once. Boards they
+        cannot finish go on to a search over the stack, and only boards whose
+        search tree grows too wide are finished by SudokuSolver one at a time.
+
+        Parameters:
+            boards (list): Puzzles in the format accepted by solve_sudoku_board.
+
+        Returns:
+            list: The result of solve_sudoku_board for each puzzle, in order.
+        """
+        if not boards:
+            return []
+
+        values = self.__boards_to_array(boards)
+        self.__propagate(values)
+        solved = self.__is_solved(values)
+
+        # Singles are forced in every solution, so the search can start from
+        # the propagated boards instead of the original puzzles.
+        open_boards = np.nonzero(~solved)[0]
+        solutions = self.__search(values[open_boards])
+        results = values.tolist()
+        for board, found in zip(open_boards, solutions):
+            results[board] = found[0] if len(found) == 1 else UNSOLVABLE_MESSAGE
+        return results
+
+    def solve_many(self, boards, chunk_size=4096):
+        """
+        Solves a stream of Sudoku puzzles in vectorized chunks.
+
+        Parameters:
+            boards (iterable): Puzzles in the format accepted by
+                            solve_sudoku_board. Consumed lazily.
+            chunk_size (int): Number of puzzles stacked into one array.
+
+        Yields:
+            list | str: The result for each puzzle, in input order.
+        """
+        boards = iter(boards)
+        while True:
+            chunk = list(itertools.islice(boards, chunk_size))
+            if not chunk:
+                return
+            yield from self.solve_boards(chunk)
+
+    def grade_levels(self, boards):
+        """
+        Rates a list of Sudoku puzzles by difficulty level.
+
+        Hidden singles and then all singles run across the whole stack,
+        which settles the "easy" and "medium" puzzles exactly as
+        SudokuSolver.grade_sudoku_board would. The stacked search then
+        rules out the puzzles without a single solution. Only the rest are
+        graded one at a time, starting from where singles stalled.
+
+        Parameters:
+            boards (list): Puzzles in the format accepted by solve_sudoku_board.
+
+        Returns:
+            list: The "level" of grade_sudoku_board for each puzzle, in order.
+        """
+        if not boards:
+            return []
+
+        values = self.__boards_to_array(boards)
+        levels = [None] * len(boards)
+        open_boards = np.arange(len(boards))
+        stages = (("hidden_singles_box", False), ("naked_singles", True))
+        for technique, naked in stages:
+            stack = values[open_boards]
+            self.__propagate(stack, naked=naked)
+            values[open_boards] = stack
+            solved = self.__is_solved(stack)
+            for board in open_boards[solved]:
+                levels[board] = TECHNIQUE_LEVELS[technique]
+            open_boards = open_boards[~solved]
+
+        # Every technique that grading needs after singles stall is found from
+        # the stalled board too, since the grader only tries them then.
+        solutions = self.__search(values[open_boards])
+        for board, found in zip(open_boards, solutions):
+            if len(found) == 1:
+                grade = self.__fallback_solver.grade_sudoku_board(
+                    values[board].tolist()
+                )
+                levels[board] = grade["level"]
+        return levels